@@ -1,11 +1,52 @@
+"""
+Public names are loaded lazily through a module level `__getattr__` (PEP 562).
+A submodule is only imported the first time one of it's names is accessed, so `from generallibrary import clamp` doesn't import pyperclip or pytz.
+"""
+import importlib
+from typing import TYPE_CHECKING
 
-from generallibrary.iterables import SortedList, getIterable, isIterable, depth, dictFirstValue, iterFirstValue, joinWithStr, addToListInDict, addToDictInDict, getFreeIndex, getRows, exclusive, inclusive, uniqueObjInList, combine, remove_duplicates, dict_index
-from generallibrary.functions import SigInfo, calculate, defaults, Operators, deco_cache, deco_cast_parameters, deco_extend, EmptyContext, deco_default_self_args, classproperty, CallTable
-from generallibrary.object import getsize, initBases, ObjInfo
-from generallibrary.time import Timer, sleep, current_datetime_formatted, current_datetime
-from generallibrary.types_ import strToDynamicType, typeChecker, getBaseClasses, getBaseClassNames, hasMethod, HierarchyStorer
-from generallibrary.values import clamp, sign, inrange, rectify, doubleRectify, confineTo, EnvVar, get_launch_options
-from generallibrary.versions import VerInfo, get_installed_packages, package_is_installed, PythonVersion, Ver
-from generallibrary.code import debug, CodeLine, clipboard_copy, clipboard_get, print_link, print_link_to_obj, get_lines, get_definition_line
-from generallibrary.diagram import TreeDiagram, Markdown, NetworkDiagram
-from generallibrary.text import comma_and_and
+_lazy_names = {
+    "generallibrary.iterables": ("SortedList", "getIterable", "isIterable", "depth", "dictFirstValue", "iterFirstValue", "joinWithStr", "addToListInDict", "addToDictInDict", "getFreeIndex", "getRows", "exclusive", "inclusive", "uniqueObjInList", "combine", "remove_duplicates", "dict_index"),
+    "generallibrary.functions": ("SigInfo", "calculate", "calculate_many", "defaults", "Operators", "deco_cast_parameters", "deco_extend", "EmptyContext", "deco_default_self_args", "classproperty", "CallTable"),
+    "generallibrary.object": ("getsize", "getsize_report", "SizeReport", "SizeEstimate", "initBases"),
+    "generallibrary.objinfo.objinfo": ("ObjInfo", ),
+    "generallibrary.cache": ("deco_cache", "Cache", "CacheInfo"),
+    "generallibrary.time": ("Timer", "sleep", "current_datetime_formatted", "current_datetime"),
+    "generallibrary.types_": ("strToDynamicType", "typeChecker", "compileTypeChecker", "getBaseClasses", "getBaseClassNames", "hasMethod", "HierarchyStorer"),
+    "generallibrary.values": ("clamp", "sign", "inrange", "rectify", "doubleRectify", "confineTo", "EnvVar", "get_launch_options"),
+    "generallibrary.versions": ("VerInfo", "get_installed_packages", "package_is_installed", "PythonVersion", "Ver"),
+    "generallibrary.code": ("debug", "CodeLine", "clipboard_copy", "clipboard_get", "print_link", "print_link_to_obj", "get_lines", "get_definition_line"),
+    "generallibrary.diagram": ("TreeDiagram", "Markdown", "NetworkDiagram"),
+    "generallibrary.text": ("comma_and_and", "markdown_table", "markdown_table_lines"),
+}
+_name_to_module = {name: module for module, names in _lazy_names.items() for name in names}
+
+__all__ = list(_name_to_module)
+
+
+def __getattr__(name):
+    """ Import the submodule defining name on first access and store name in globals. """
+    module = _name_to_module.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(module), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from generallibrary.iterables import SortedList, getIterable, isIterable, depth, dictFirstValue, iterFirstValue, joinWithStr, addToListInDict, addToDictInDict, getFreeIndex, getRows, exclusive, inclusive, uniqueObjInList, combine, remove_duplicates, dict_index
+    from generallibrary.functions import SigInfo, calculate, calculate_many, defaults, Operators, deco_cast_parameters, deco_extend, EmptyContext, deco_default_self_args, classproperty, CallTable
+    from generallibrary.object import getsize, getsize_report, SizeReport, SizeEstimate, initBases
+    from generallibrary.objinfo.objinfo import ObjInfo
+    from generallibrary.cache import deco_cache, Cache, CacheInfo
+    from generallibrary.time import Timer, sleep, current_datetime_formatted, current_datetime
+    from generallibrary.types_ import strToDynamicType, typeChecker, compileTypeChecker, getBaseClasses, getBaseClassNames, hasMethod, HierarchyStorer
+    from generallibrary.values import clamp, sign, inrange, rectify, doubleRectify, confineTo, EnvVar, get_launch_options
+    from generallibrary.versions import VerInfo, get_installed_packages, package_is_installed, PythonVersion, Ver
+    from generallibrary.code import debug, CodeLine, clipboard_copy, clipboard_get, print_link, print_link_to_obj, get_lines, get_definition_line
+    from generallibrary.diagram import TreeDiagram, Markdown, NetworkDiagram
+    from generallibrary.text import comma_and_and, markdown_table, markdown_table_lines
@@ -0,0 +1,17 @@
+"""
+Ver is kept in it's own module so that distutils is only imported when Ver is first accessed through `generallibrary.versions`.
+"""
+
+from distutils.version import StrictVersion
+import re
+
+
+# Todo: Replace this temporary Ver class with revamped VerInfo split into isolated parts.
+class Ver(StrictVersion):
+    def __init__(self, ver):
+        super().__init__(str(ver))
+
+    def bump(self):
+        """ Return a new Ver with bumped last value. """
+        bulk, micro = re.findall("(.*)(\\d)", str(self))[0]
+        return Ver(f"{bulk}{int(micro) + 1}")
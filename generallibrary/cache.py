@@ -0,0 +1,537 @@
+import functools
+import inspect
+import os
+import pickle
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+
+
+class CacheInfo(namedtuple("CacheInfo", ("hits", "misses", "evictions", "expired", "maxsize", "currsize", "bytes"))):
+    """ Counters returned by `cache_info()` of a function decorated with `deco_cache`. """
+    __slots__ = ()
+
+
+class _Mark:
+    """ Sentinel that pickles as a reference to itself, keeping keys with it stable between processes. """
+    __slots__ = ("name", )
+
+    def __init__(self, name):
+        self.name = name
+
+    def __reduce__(self):
+        return self.name
+
+    def __repr__(self):
+        return self.name
+
+
+_MISSING = _Mark("_MISSING")
+_KWARGS_MARK = _Mark("_KWARGS_MARK")
+_UNBOUND_MARK = _Mark("_UNBOUND_MARK")
+
+
+class _CacheStats:
+    """ Counters shared by all Cache storages of one decorated function. """
+    __slots__ = ("hits", "misses", "evictions", "expired", "currsize", "bytes")
+
+    def __init__(self):
+        self.hits = self.misses = self.evictions = self.expired = self.currsize = self.bytes = 0
+
+
+class Cache:
+    """ LRU storage with optional time to live and byte budget.
+        Lookups, inserts and evictions are O(1), sizes are only measured with `getsize` on insert if `max_bytes` is defined.
+        Every read, write and eviction holds a lock so that a Cache can be shared by threads.
+
+        :param maxsize: Max number of entries, None for unbounded and 0 to disable.
+        :param ttl: Seconds an entry lives, None to live forever.
+        :param max_bytes: Max summed `getsize` of values, None for unbounded.
+        :param lock: Reentrant lock to hold, give the same lock to Caches sharing stats. """
+    def __init__(self, maxsize=128, ttl=None, max_bytes=None, stats=None, lock=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = _CacheStats() if stats is None else stats
+        self.lock = threading.RLock() if lock is None else lock
+
+        self.bytes = 0
+        self._data = OrderedDict()  # key: (value, expires, size)
+
+    def get(self, key, default=None):
+        """ Return a stored value and mark it as recently used, or default if missing or expired. """
+        with self.lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+
+            value, expires, size = entry
+            if expires is not None and expires <= time.monotonic():
+                self._pop(key)
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def peek(self, key, default=None):
+        """ Return a stored value if it hasn't expired, without counting it or marking it as recently used. """
+        with self.lock:
+            entry = self._data.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+            return default
+        return entry[0]
+
+    def set(self, key, value):
+        """ Store a value, evicting least recently used entries until limits are met.
+            A value larger than `max_bytes` is not stored. """
+        if self.maxsize == 0:
+            return
+
+        size = 0
+        if self.max_bytes is not None:
+            size = getsize(value)
+            if size > self.max_bytes:
+                return
+
+        with self.lock:
+            if key in self._data:
+                self._pop(key)
+
+            expires = None if self.ttl is None else time.monotonic() + self.ttl
+            self._data[key] = (value, expires, size)
+            self.bytes += size
+            self.stats.bytes += size
+            self.stats.currsize += 1
+
+            while (self.maxsize is not None and len(self._data) > self.maxsize) or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                self._pop(next(iter(self._data)))
+                self.stats.evictions += 1
+
+    def _pop(self, key):
+        """ Remove an entry, lock has to be held. """
+        value, expires, size = self._data.pop(key)
+        self.bytes -= size
+        self.stats.bytes -= size
+        self.stats.currsize -= 1
+
+    def clear(self):
+        """ Remove all entries without counting them as evictions. """
+        with self.lock:
+            self.stats.bytes -= self.bytes
+            self.stats.currsize -= len(self._data)
+            self.bytes = 0
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+class DiskCache:
+    """ Pickled values stored as files in a directory, can be shared by processes on the same host.
+        Files are written to a temporary file and then renamed so that readers never see partial files.
+        Reading a file touches it, so removing the oldest modified files first is LRU.
+        Eviction removes files until `low_water` of `max_bytes` is left, so that the directory isn't scanned on every write once it's full.
+
+        :param directory: Directory to store files in, created if missing.
+        :param max_bytes: Max summed size of files in directory, None for unbounded. """
+    suffix = ".pkl"
+    low_water = 0.9
+
+    def __init__(self, directory, max_bytes=None):
+        from pathlib import Path
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._bytes = sum(size for _, size, _ in self._files()) if max_bytes is not None else 0  # Estimate, other processes write too
+
+    def _path(self, name):
+        return self.directory / f"{name}{self.suffix}"
+
+    def _files(self, prefix=""):
+        """ Yield (mtime, size, path) of stored files. """
+        for path in self.directory.glob(f"{prefix}*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, stat.st_size, path
+
+    def get(self, name, default=None):
+        """ Return unpickled value of a name, or default if missing or unreadable. """
+        path = self._path(name)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return default
+        except Exception:  # Corrupt or from an incompatible version
+            self._unlink(path)
+            return default
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, name, value):
+        """ Store a picklable value atomically, returns whether it was stored. """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return False
+
+        import tempfile
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self._path(name))
+        except BaseException:
+            self._unlink(self.directory / os.path.basename(temp_path))
+            raise
+
+        if self.max_bytes is not None:
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self.evict()
+        return True
+
+    def evict(self):
+        """ Remove least recently used files until size is within `low_water` of max_bytes. """
+        files = sorted(self._files())
+        self._bytes = sum(size for _, size, _ in files)
+        target = self.max_bytes * self.low_water
+        for _, size, path in files:
+            if self._bytes <= target:
+                break
+            self._unlink(path)
+            self._bytes -= size
+
+    def clear(self, prefix="", keep_prefix=None):
+        """ Remove files whose name starts with prefix, except those starting with keep_prefix. """
+        for _, size, path in list(self._files(prefix=prefix)):
+            if keep_prefix is None or not path.name.startswith(keep_prefix):
+                self._unlink(path)
+                self._bytes -= size
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _InstanceCaches:
+    """ One Cache per instance, stored by id and removed when the instance is garbage collected.
+        Identity is used instead of a WeakKeyDictionary so that instances that define `__eq__` don't share results. """
+    def __init__(self, new_cache, lock):
+        self.new_cache = new_cache
+        self.lock = lock
+        self._caches = {}  # id: (weakref, Cache)
+
+    def get(self, instance):
+        """ Return Cache of an instance, or None if it cannot be weakly referenced. """
+        key = id(instance)
+        try:
+            return self._caches[key][1]
+        except KeyError:
+            pass
+
+        try:
+            ref = weakref.ref(instance, lambda _, key=key: self.remove(key))
+        except TypeError:
+            return None
+        cache = self.new_cache()
+        self._caches[key] = (ref, cache)
+        return cache
+
+    def remove(self, key):
+        """ Remove Cache of an instance by id. """
+        with self.lock:
+            if (item := self._caches.pop(key, None)) is not None:
+                item[1].clear()
+
+    def clear(self):
+        """ Remove all instances' Caches. """
+        for key in list(self._caches):
+            self.remove(key)
+
+
+class _Flight:
+    """ A computation of one key that other threads can wait for. """
+    __slots__ = ("event", "value", "exception")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.exception = None
+
+
+class _StripedFlights:
+    """ Table of in flight computations split into stripes, each with it's own lock.
+        Unrelated keys rarely share a stripe and the locks are only held to look up or register a flight. """
+    def __init__(self, stripes):
+        self._stripes = [(threading.Lock(), {}) for _ in range(stripes)]
+
+    def stripe(self, key):
+        """ Return lock and flights dict of a key's stripe. """
+        return self._stripes[hash(key) % len(self._stripes)]
+
+
+def _make_key(args, kwargs):
+    """ Hashable key from args and kwargs, like functools' lru_cache. """
+    if kwargs:
+        return args + (_KWARGS_MARK, ) + tuple(kwargs.items())
+    if len(args) == 1 and type(args[0]) in (int, str):
+        return args[0]
+    return args
+
+
+def _normalized_key_function(func, skip_first):
+    """ Return a function creating the same key for every way of calling func with the same arguments, defaults included.
+        Uses a SigBinder so that no reflection is done per call.
+        Calls that don't bind cleanly, such as with missing, extra or unknown arguments, get a key of the raw arguments instead,
+        so that they never share a result with a valid call and func raises it's TypeError.
+
+        :param skip_first: Leave out the first positional parameter, used for `self` with per instance caches. """
+    binder = SigBinder(func)
+    spec = binder.spec
+    packed = (spec.packedArgsName, spec.packedKwargsName)
+    skipped = spec.positionalArgNames[0] if skip_first and spec.positionalArgNames else None
+    names = tuple(name for name in spec.names if name not in packed and name != skipped)
+    names_set = spec.names_set
+    bind = binder.bind
+    binds_cleanly = _compile_binds_cleanly(spec)
+
+    def _key(args, kwargs):
+        if not binds_cleanly(args, kwargs):
+            return (_UNBOUND_MARK, _make_key(args, kwargs))
+        allArgs = bind(*args, **kwargs)
+        key = tuple([allArgs.get(name) for name in names])
+        if spec.packedArgsName:
+            key += (_KWARGS_MARK, tuple(allArgs.get(spec.packedArgsName, ())))
+        if spec.packedKwargsName:
+            key += (_KWARGS_MARK, ) + tuple(sorted((name, value) for name, value in allArgs.items() if name not in names_set))
+        return key
+    return _key
+
+
+def _code_fingerprint(code):
+    """ Return a string identifying a code object that is stable between processes, nested code objects included. """
+    consts = []
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            consts.append(_code_fingerprint(const))
+        elif isinstance(const, frozenset):
+            consts.append(repr(sorted(map(repr, const))))
+        else:
+            consts.append(repr(const))
+    return repr((code.co_code, consts, code.co_names, code.co_varnames, code.co_firstlineno))
+
+
+def _disk_name_function(func, disk):
+    """ Return a function returning a stable file name for a call of func, or None if the arguments can't be pickled.
+        Names start with func's qualified name and a hash of it's source and code, so that lambdas on one line don't share files.
+        Files of previous sources are removed, except for lambdas as many of them share a qualified name. """
+    import hashlib
+
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = ""
+    code = getattr(func, "__code__", None)
+    identity = f"{source}\n{repr(func) if code is None else _code_fingerprint(code)}"
+
+    func_name = re.sub(r"[^\w.]", "_", f"{func.__module__}.{func.__qualname__}")
+    prefix = f"{func_name}-{hashlib.sha256(identity.encode()).hexdigest()[:16]}-"
+    if not func.__qualname__.endswith("<lambda>"):
+        disk.clear(prefix=f"{func_name}-", keep_prefix=prefix)
+
+    make_key = _normalized_key_function(func=func, skip_first=False)
+
+    def _name(args, kwargs):
+        try:
+            return f"{prefix}{hashlib.sha256(pickle.dumps(make_key(args, kwargs), protocol=4)).hexdigest()}"
+        except Exception:
+            return None
+    return _name
+
+
+def deco_cache(maxsize=128, ttl=None, max_bytes=None, per_instance=None, normalize=False, thread_safe=False, stripes=64, directory=None, max_disk_bytes=None):
+    """ Enable caching for a method or function.
+        Decorated function gets `cache_info()` and `cache_clear()` like functools' lru_cache.
+        Coroutine functions get a coroutine wrapper where concurrent callers with the same key await one shared task.
+        Their results are stored when the task is done, exceptions and cancellations are not stored.
+
+        :param maxsize: Max number of entries, None for unbounded and 0 to disable.
+        :param ttl: Seconds a result lives, None to live forever.
+        :param max_bytes: Max summed `getsize` of results, measured once per stored result.
+        :param per_instance: Store results of a method in a separate Cache for each weakly referenced instance,
+            without keeping the instance alive. Defaults to True if the first parameter is named `self`.
+        :param normalize: Bind arguments to parameters so that `f(1, b=2)`, `f(1, 2)` and `f(1)` with default `b=2` share one result.
+        :param thread_safe: Let one thread compute a missing key while other threads with the same key wait for it.
+            Storage is always locked, without this threads missing the same key all call func. Not needed for coroutine functions.
+        :param stripes: Number of locks that in flight computations are split into when thread_safe.
+        :param directory: Also store pickled results in this directory with a DiskCache, keyed by qualified name, source and normalized arguments.
+            Results survive restarts and are shared by processes, changing the function's source invalidates them.
+        :param max_disk_bytes: Max summed size of files in directory. """
+    def _decorator(func):
+        stats = _CacheStats()
+        store_lock = threading.RLock()  # Shared by all Caches as they share stats
+        new_cache = lambda: Cache(maxsize=maxsize, ttl=ttl, max_bytes=max_bytes, stats=stats, lock=store_lock)
+        cache = new_cache()
+
+        use_instances = per_instance
+        if use_instances is None:
+            try:
+                use_instances = SignatureSpec.get(func).positionalArgNames[:1] == ("self", )
+            except (ValueError, TypeError):  # No signature, such as some builtins
+                use_instances = False
+        instance_caches = _InstanceCaches(new_cache=new_cache, lock=store_lock) if use_instances else None
+
+        if normalize:
+            make_key = _normalized_key_function(func=func, skip_first=False)
+            make_instance_key = _normalized_key_function(func=func, skip_first=True)
+        else:
+            make_key = _make_key
+            make_instance_key = lambda args, kwargs: _make_key(args[1:], kwargs)
+
+        disk = None if directory is None else DiskCache(directory=directory, max_bytes=max_disk_bytes)
+        disk_name = None if disk is None else _disk_name_function(func=func, disk=disk)
+
+        def _compute(args, kwargs):
+            """ Get result from disk or call func. """
+            name = disk_name(args, kwargs) if disk else None
+            if name is not None:
+                value = disk.get(name, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+            value = func(*args, **kwargs)
+            if name is not None:
+                disk.set(name, value)
+            return value
+
+        def _get_cache_and_key(args, kwargs):
+            if instance_caches is not None and args:
+                with store_lock:
+                    instance_cache = instance_caches.get(args[0])
+                if instance_cache is not None:
+                    return instance_cache, make_instance_key(args, kwargs)
+            return cache, make_key(args, kwargs)
+
+        if inspect.iscoroutinefunction(func):
+            import asyncio
+
+            in_flight = {}  # (store, key): Task
+
+            def _task_done(task, store, key, name):
+                del in_flight[(store, key)]
+                if not task.cancelled() and task.exception() is None:
+                    store.set(key, task.result())
+                    if name is not None:
+                        disk.set(name, task.result())
+
+            @functools.wraps(func)
+            async def _wrapper(*args, **kwargs):
+                store, key = _get_cache_and_key(args, kwargs)
+                value = store.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                task = in_flight.get((store, key))
+                if task is None:
+                    name = disk_name(args, kwargs) if disk else None
+                    if name is not None:
+                        value = disk.get(name, _MISSING)
+                        if value is not _MISSING:
+                            store.set(key, value)
+                            return value
+
+                    task = in_flight[(store, key)] = asyncio.ensure_future(func(*args, **kwargs))
+                    task.add_done_callback(functools.partial(_task_done, store=store, key=key, name=name))
+                return await asyncio.shield(task)
+        elif thread_safe:
+            flights = _StripedFlights(stripes=stripes)
+
+            @functools.wraps(func)
+            def _wrapper(*args, **kwargs):
+                store, key = _get_cache_and_key(args, kwargs)
+                value = store.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                stripe_lock, stripe_flights = flights.stripe(key)
+                with stripe_lock:
+                    flight = stripe_flights.get((store, key))
+                    owner = flight is None
+                    if owner:
+                        value = store.peek(key, _MISSING)  # Stored by a finished flight since first lookup
+                        if value is not _MISSING:
+                            return value
+                        flight = stripe_flights[(store, key)] = _Flight()
+
+                if not owner:
+                    flight.event.wait()
+                    if flight.exception is not None:
+                        raise flight.exception
+                    return flight.value
+
+                try:
+                    flight.value = _compute(args, kwargs)
+                    store.set(key, flight.value)
+                    return flight.value
+                except BaseException as e:
+                    flight.exception = e
+                    raise
+                finally:
+                    with stripe_lock:
+                        del stripe_flights[(store, key)]
+                    flight.event.set()
+        else:
+            @functools.wraps(func)
+            def _wrapper(*args, **kwargs):
+                store, key = _get_cache_and_key(args, kwargs)
+                value = store.get(key, _MISSING)
+                if value is _MISSING:
+                    value = _compute(args, kwargs)
+                    store.set(key, value)
+                return value
+
+        def cache_info():
+            """ Return a CacheInfo with counters of all storages. """
+            return CacheInfo(hits=stats.hits, misses=stats.misses, evictions=stats.evictions, expired=stats.expired,
+                             maxsize=maxsize, currsize=stats.currsize, bytes=stats.bytes)
+
+        def cache_clear():
+            """ Remove all stored results and reset counters. """
+            with store_lock:
+                cache.clear()
+                if instance_caches is not None:
+                    instance_caches.clear()
+                stats.hits = stats.misses = stats.evictions = stats.expired = 0
+
+        _wrapper.cache_info = cache_info
+        _wrapper.cache_clear = cache_clear
+        _wrapper.disk_cache = disk
+        return _wrapper
+    return _decorator
+
+
+from generallibrary.functions import SignatureSpec, SigBinder, _compile_binds_cleanly
+from generallibrary.object import getsize
@@ -1,9 +1,7 @@
 
-import pyperclip
 import os
 import inspect
 import re
-import pandas as pd
 
 from generallibrary.diagram import TreeDiagram
 from generallibrary.object import initBases
@@ -12,6 +10,8 @@ from generallibrary.object import initBases
 def clipboard_copy(s):
     """ Copy a string to clipboard.
         Rudely tries to installs xclip on linux if it fails. """
+    import pyperclip
+
     def _call():
         return pyperclip.copy(s)
 
@@ -24,6 +24,8 @@ def clipboard_copy(s):
 
 def clipboard_get():
     """ Get clipboard string. """
+    import pyperclip
+
     return pyperclip.paste()
 
 
@@ -43,9 +45,9 @@ class CodeLine(TreeDiagram):
     def get_lines(self, watermark=True):
         """ Generate a list of formatted code lines by iterating stored _Line instances. """
         lines = []
-        for codeLine in self.get_all(include_self=False):
+        for codeLine in self.iter_all(include_self=False):
             lines.extend([""] * codeLine.space_before)
-            lines.append(f"{self.indent_str * (len(codeLine.get_all_parents()) - 1)}{codeLine.code_str}")
+            lines.append(f"{self.indent_str * (codeLine.depth - 1)}{codeLine.code_str}")
             lines.extend([""] * codeLine.space_after)
 
         if watermark:
@@ -130,14 +132,14 @@ def get_lines(obj):
     parent_objInfo = ObjInfo(obj)
     parent_objInfo.get_attrs()
     lines = []
-    for objInfo in parent_objInfo.get_all():  # type: ObjInfo
+    for objInfo in parent_objInfo.iter_all():  # type: ObjInfo
         if objInfo.is_class() or objInfo.is_function():
             obj_lines = inspect.getsourcelines(objInfo.obj)[0]
             lines.extend([line for line in obj_lines if not re.match("^( *)?\\n$", line)])
     return lines
 
 
-from generallibrary.object import ObjInfo
+from generallibrary.objinfo.objinfo import ObjInfo
 
 
 
@@ -1,10 +1,13 @@
+import json
+from collections import deque
+
 
 from generallibrary.object import initBases
 from generallibrary.functions import deco_extend
 from generallibrary.values import clamp
+from generallibrary.text import markdown_table
 
 
-import pandas
 
 
 class Route(list):
@@ -194,6 +197,10 @@ class KeyInfo(str):
         self.unique = unique
 
 
+_MISSING = object()
+_LOADING = object()  # Given as children_dicts by `load` to postpone hook_create_post until the node's children are loaded
+
+
 @initBases
 class TreeDiagram:
     """ Saveable tree diagram with optional storage.
@@ -209,6 +216,11 @@ class TreeDiagram:
         self._children = []
         self.data = {}
         self._parent = None
+        self._depth = 0
+        self._positions = {}
+        self._positions_valid = 0
+        self._unique_indexes = {}
+        self._unique_counts = {}
 
         self.hook_create_pre()
 
@@ -218,6 +230,9 @@ class TreeDiagram:
             @initBases calls this automatically. """
         self.set_parent(parent=parent, old_parent=None)
 
+        if children_dicts is _LOADING:
+            return
+
         if children_dicts:
             for child_dict in children_dicts:
                 self.load(child_dict, parent=self)
@@ -276,33 +291,120 @@ class TreeDiagram:
             old_parent = self._parent
 
         if old_parent:
-            old_parent._children.remove(self)
+            position = old_parent._child_position(self)
+            del old_parent._children[position]
+            old_parent._positions.pop(id(self), None)
+            old_parent._positions_valid = min(old_parent._positions_valid, position)
+            for keyInfo in self.data_keys:
+                if keyInfo.unique:
+                    old_parent._unindex_unique(child=self, key=keyInfo, value=getattr(self, keyInfo, None))
 
             old_parent.hook_lose_child(child=self)
             self.hook_lose_parent(old_parent=old_parent, parent=parent)
 
         if parent:
             # Remove possible existing child with matching unique key values
-            for keyInfo in self.data_keys:
-                if keyInfo.unique:
-                    sibling = parent.get_child_by_key_values(**{keyInfo: getattr(self, keyInfo)})
-                    if sibling:
-                        sibling.remove()
+            unique_keys = [keyInfo for keyInfo in self.data_keys if keyInfo.unique]
+            for keyInfo in unique_keys:
+                for sibling in parent.get_children_by_key_values(**{keyInfo: getattr(self, keyInfo)}):
+                    sibling.remove()
 
             # if self in parent.all_parents():
             #     raise AttributeError(f"Cannot set {parent} as parent for {self} as it becomes circular. ")
-            if index is None:
+            if index is not None and index < 0:
+                index = max(index + len(parent._children), 0)
+            if index is None or index >= len(parent._children):
+                if parent._positions_valid == len(parent._children):
+                    parent._positions[id(self)] = parent._positions_valid
+                    parent._positions_valid += 1
                 parent._children.append(self)
             else:
                 parent._children.insert(index, self)
+                parent._positions_valid = min(parent._positions_valid, index)
+
+            for keyInfo in unique_keys:
+                parent._index_unique(child=self, key=keyInfo, value=getattr(self, keyInfo))
 
             parent.hook_add_child(self)
             self.hook_new_parent(parent=parent, old_parent=old_parent)
 
         self._parent = parent
+
+        depth_change = (parent._depth + 1 if parent else 0) - self._depth
+        if depth_change:
+            for node in (self.iter_all() if self._children else (self, )):
+                node._depth += depth_change
         # return parent
         return self
 
+    @property
+    def depth(self):
+        """ Get number of parents this Node has, maintained by `set_parent`.
+
+            :rtype: int """
+        return self._depth
+
+    def _child_position(self, child):
+        """ Get index of a child from a dict of child ids to indexes.
+            Indexes before `_positions_valid` are always correct, the rest are updated lazily when needed.
+            The whole dict is rebuilt if a child is missing or found at the wrong index, such as with ids stored by another process. """
+        children = self._children
+        position = self._positions.get(id(child))
+        if position is None or position >= self._positions_valid:
+            self._positions.update(zip(map(id, children[self._positions_valid:]), range(self._positions_valid, len(children))))
+            self._positions_valid = len(children)
+            position = self._positions.get(id(child))
+
+        if position is None or position >= len(children) or children[position] is not child:
+            self._positions = {id(indexed_child): i for i, indexed_child in enumerate(children)}
+            self._positions_valid = len(children)
+            position = self._positions.get(id(child))
+            if position is None or children[position] is not child:
+                raise ValueError(f"{child} is not a child of {self}")
+        return position
+
+    def __getstate__(self):
+        """ Leave out the position index as it's keyed by ids, it's rebuilt when needed after copying or unpickling. """
+        state = self.__dict__.copy()
+        state.pop("_positions", None)
+        state.pop("_positions_valid", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__["_positions"] = {}
+        self.__dict__["_positions_valid"] = 0
+
+    def _index_unique(self, child, key, value):
+        """ Store child in this parent's index of a unique data key, children with unhashable values are stored together under `_MISSING`.
+            Indexed children are counted per key to know whether the index covers every child. """
+        index = self._unique_indexes.setdefault(key, {})
+        try:
+            index.setdefault(value, []).append(child)
+        except TypeError:
+            index.setdefault(_MISSING, []).append(child)
+        self._unique_counts[key] = self._unique_counts.get(key, 0) + 1
+
+    def _unindex_unique(self, child, key, value):
+        """ Remove child from this parent's index of a unique data key. """
+        index = self._unique_indexes.get(key)
+        if index is None:
+            return
+        try:
+            hash(value)
+        except TypeError:
+            value = _MISSING
+        children = index.get(value)
+        if children is None:
+            return
+        for i, indexed_child in enumerate(children):
+            if indexed_child is child:
+                del children[i]
+                self._unique_counts[key] -= 1
+                break
+        if not children:
+            del index[value]
+
     def remove(self):
         """ Remove this Node. """
         self.set_parent(None)
@@ -323,10 +425,15 @@ class TreeDiagram:
         """ Get this Node's parent.
 
             :rtype: TreeDiagram or Any """
-        if index == 0:
-            return self._parent
-        else:
-            return self._singular_alternatives(self.get_all_parents(), index)
+        if index < 0:
+            index += self._depth
+        if not 0 <= index < self._depth:
+            return None
+
+        parent = self._parent
+        for _ in range(index):
+            parent = parent._parent
+        return parent
 
     def get_children(self):
         """ Get a list of all children this Node has, empty list if None.
@@ -341,7 +448,22 @@ class TreeDiagram:
         return self._singular_alternatives(self.get_children(), index)
 
     def get_children_by_key_values(self, **key_values):
-        """ Get a list of children that matches all given key values. """
+        """ Get a list of children that matches all given key values.
+            Uses the index of a unique data key if one is given with a hashable value and every child is indexed by it,
+            instead of checking every child. Otherwise children of classes without that unique key could be missed. """
+        for key, value in key_values.items():
+            if key in self._unique_indexes and self._unique_counts.get(key) == len(self._children):
+                index = self._unique_indexes[key]
+                try:
+                    candidates = index.get(value, [])
+                except TypeError:
+                    break
+                if _MISSING in index:
+                    candidates = candidates + index[_MISSING]
+                children = [child for child in candidates if all([getattr(child, key) == value for key, value in key_values.items()])]
+                if len(children) > 1:
+                    children.sort(key=self._child_position)
+                return children
         return [child for child in self.get_children() if all([getattr(child, key) == value for key, value in key_values.items()])]
 
     def get_child_by_key_values(self, index=0, **key_values):
@@ -350,38 +472,78 @@ class TreeDiagram:
             :rtype: TreeDiagram or Any """
         return self._singular_alternatives(self.get_children_by_key_values(**key_values), index)
 
-    def get_all(self, include_self=True):
-        """ Return a flat one-dimensional list of all nodes in this Tree.
+    def iter_all(self, include_self=True, order="pre", max_depth=None):
+        """ Generator yielding all nodes in this Tree, walked with an explicit stack without copying any children.
+            Use `get_all` instead if the Tree is changed while iterating.
+
+            :param include_self: Whether to yield this Node.
+            :param order: "pre" for parents before children, "post" for children before parents or "level" for one depth at a time.
+            :param int max_depth: Optional depth to stop at, relative to this Node which is 0.
+            :rtype: collections.Iterable[TreeDiagram or any] """
+        if order not in ("pre", "post", "level"):
+            raise AttributeError(f"order has to be 'pre', 'post' or 'level', not {order!r}")
+
+        if max_depth is None:
+            max_depth = float("inf")
+
+        if order == "level":
+            queue = deque(((self, 0), ))
+            while queue:
+                node, depth = queue.popleft()
+                if include_self or node is not self:
+                    yield node
+                if depth < max_depth:
+                    depth += 1
+                    queue.extend((child, depth) for child in node._children)
+
+        elif order == "pre":
+            if include_self:
+                yield self
+            if max_depth < 1:
+                return
+            stack = [iter(self._children)]
+            while stack:
+                node = next(stack[-1], None)
+                if node is None:
+                    stack.pop()
+                    continue
+                yield node
+                if len(stack) < max_depth:
+                    stack.append(iter(node._children))
 
-            :rtype: list[TreeDiagram or any] """
-        nodes = []
-        temp = [self]
-        while temp:
-            treeDiagram = temp[0]
-            del temp[0]
+        else:
+            stack = [(self, iter(self._children) if max_depth >= 1 else iter(()))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    if include_self or node is not self:
+                        yield node
+                else:
+                    stack.append((child, iter(child._children) if len(stack) < max_depth else iter(())))
 
-            if not (treeDiagram is self and not include_self):
-                nodes.append(treeDiagram)
+    def get_all(self, include_self=True, order="pre", max_depth=None):
+        """ Return a flat one-dimensional list of all nodes in this Tree.
+            See `iter_all` for parameters.
 
-            children = treeDiagram.get_children()
-            for child in reversed(children):
-                temp.insert(0, child)
-        return nodes
+            :rtype: list[TreeDiagram or any] """
+        return list(self.iter_all(include_self=include_self, order=order, max_depth=max_depth))
 
     def get_siblings(self):
         """ Get a list of all siblings. """
         if self.get_parent() is None:
             return []
         l = self.get_parent().get_children()
-        l.remove(self)
+        del l[self.get_index()]
         return l
 
     def _sibling_helper(self, direction):
-        if self.get_parent() is None:
-            return None
         parent = self.get_parent()
-        children = parent.get_children()
-        index = children.index(self) + direction
+        if parent is None:
+            return None
+        children = parent._children
+        index = parent._child_position(self) + direction
         return children[index] if 0 <= index < len(children) else None
 
     def get_next_sibling(self):
@@ -395,78 +557,190 @@ class TreeDiagram:
     def get_index(self):
         """ Return index of this node among it's siblings. """
         assert self.get_parent()
-        return self.get_parent().get_children().index(self)
+        return self.get_parent()._child_position(self)
 
     def set_index(self, index):
         """ Move this node among it's siblings. """
         parent = self.get_parent()
         assert parent
-        if parent.get_children()[index] is not self:
+        if parent._children[index] is not self:
             self.remove()
             self.set_parent(parent=parent, index=index)
 
     def save(self):
-        """ Recursively save by returning a new dictionary. """
-        data = self.data.copy()
-        data["children_dicts"] = [child.save() for child in self.get_children()]
-        data["class_name"] = self.__class__.__name__  # Maybe put this in init instead
-        return data
+        """ Save by returning a new dictionary, walks the Tree iteratively so it works at any depth. """
+        saved = {**self.data, "children_dicts": [], "class_name": self.__class__.__name__}  # Maybe put class_name in init instead
+        stack = [(self, saved["children_dicts"])]
+        while stack:
+            node, children_dicts = stack.pop()
+            for child in node._children:
+                child_children_dicts = []
+                children_dicts.append({**child.data, "children_dicts": child_children_dicts, "class_name": child.__class__.__name__})
+                if child._children:
+                    stack.append((child, child_children_dicts))
+        return saved
 
     @classmethod
     def load(cls, d, parent=None):
-        """ Create a new Tree from a dictionary save.
+        """ Create a new Tree from a dictionary save, iteratively so it works at any depth.
+            Each node is created before it's children are loaded, and it's `hook_create_post` is called after them like a recursive load would.
+            A class name is looked up once per class it's looked up in.
 
             :rtype: TreeDiagram or Any """
-        class_ = cls if cls.__name__ == d["class_name"] else getattr(cls, d["class_name"], globals().get(d["class_name"]))
-        if class_ is None:  # Maybe we could search bases as well, giving us a fourt option... Very messy
-            raise AttributeError(f"Couldn't find class '{d['class_name']}' inside itself, try HierarchyStorer.")
-
-        instance = class_(parent=parent, **d)
-        # If a key is not already defined by argument in an __init__ (through **d above) then we need to set it here
-        for keyInfo in instance.data_keys:
-            if getattr(instance, keyInfo, None) != d[keyInfo]:
-                setattr(instance, keyInfo, d[keyInfo])
+        classes = {}
+        root = None
+        stack = [(cls, d, parent)]
+        while stack:
+            lookup_cls, d, parent = stack.pop()
+            if lookup_cls is _LOADING:  # All of parent's children are loaded
+                parent.hook_create_post()
+                parent._load_data(data=d)
+                continue
+
+            instance = lookup_cls._load_node(class_name=d["class_name"], kwargs={**d, "parent": parent, "children_dicts": _LOADING}, data=d, classes=classes)
+            if root is None:
+                root = instance
+            stack.append((_LOADING, d, instance))
+            stack.extend((type(instance), child_dict, instance) for child_dict in reversed(d.get("children_dicts") or ()))
+        return root
+
+    @classmethod
+    def _load_node(cls, class_name, kwargs, data, classes):
+        """ Create a single node for `load` and `load_stream`.
+
+            :param class_name: Name of class to look for in cls or globals, unless it's cls' own name.
+            :param kwargs: Keyword arguments to create node with.
+            :param data: Dict with a value for each data key.
+            :param classes: Dict caching found classes by `(cls, class_name)`. """
+        class_ = classes.get((cls, class_name))
+        if class_ is None:
+            class_ = cls if cls.__name__ == class_name else getattr(cls, class_name, globals().get(class_name))
+            if class_ is None:  # Maybe we could search bases as well, giving us a fourt option... Very messy
+                raise AttributeError(f"Couldn't find class '{class_name}' inside itself, try HierarchyStorer.")
+            classes[cls, class_name] = class_
+
+        instance = class_(**kwargs)
+        if kwargs.get("children_dicts") is not _LOADING:  # Otherwise `load` does it after hook_create_post
+            instance._load_data(data=data)
         return instance
 
+    def _load_data(self, data):
+        """ If a key is not already defined by argument in an __init__ then we need to set it here. """
+        self_data = self.data
+        for keyInfo in self.data_keys:
+            value = data[keyInfo]
+            if self_data.get(keyInfo, _MISSING) is not value and getattr(self, keyInfo, None) != value:
+                setattr(self, keyInfo, value)
+
+    def dump(self, fp, order="pre"):
+        """ Write this Tree to a text file object as JSON Lines, one record per node.
+            Each record has `id`, `parent_id`, `class_name` and `data`, parents are always written before their children.
+            Values in data have to be serializable by json.
+
+            :param fp: Text file object with a `write` method.
+            :param order: "pre" to keep subtrees together or "level" to write one depth at a time, see `iter_all`. """
+        if order not in ("pre", "level"):
+            raise AttributeError(f"order has to be 'pre' or 'level' so that parents come before children, not {order!r}")
+
+        ids = {}
+        for node_id, node in enumerate(self.iter_all(order=order)):
+            ids[id(node)] = node_id
+            parent_id = None if node is self else ids[id(node._parent)]
+            fp.write(f"{json.dumps({'id': node_id, 'parent_id': parent_id, 'class_name': node.__class__.__name__, 'data': node.data})}\n")
+
+    @classmethod
+    def iter_load_stream(cls, fp, parent=None):
+        """ Generator creating and yielding one node at a time from JSON Lines written by `dump`.
+            A node is attached to it's parent before it's yielded, so the top levels can be used before the whole stream is read.
+
+            :param fp: Text file object or any iterable of lines.
+            :param parent: Parent for the record without a parent_id.
+            :rtype: collections.Iterable[TreeDiagram or Any] """
+        classes = {}
+        nodes = {}
+        for line in fp:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            node_parent = parent if record["parent_id"] is None else nodes[record["parent_id"]]
+            lookup_cls = cls if record["parent_id"] is None else type(node_parent)
+            data = record["data"]
+            node = nodes[record["id"]] = lookup_cls._load_node(class_name=record["class_name"], kwargs={**data, "parent": node_parent}, data=data, classes=classes)
+            yield node
+
+    @classmethod
+    def load_stream(cls, fp, parent=None):
+        """ Create a new Tree from JSON Lines written by `dump`, see `iter_load_stream`.
+
+            :rtype: TreeDiagram or Any """
+        root = None
+        for node in cls.iter_load_stream(fp=fp, parent=parent):
+            if root is None:
+                root = node
+        return root
+
     def copy_to(self, parent=None):
         """ Copy this Node along with it's children by using save and load."""
         return self.load(d=self.save(), parent=parent)
 
-    def view(self, indent=1, relative=False, custom_repr=None, spacer=" ", print_out=True):
-        """ Get a printable string showing a clear view of this TreeDiagram structure.
-            Hides additional lines of a node's repr. """
-        top = self.copy_to(None) if relative else self
-
-        lines = []
-        for node in top.get_all():
-            lanes = []
-            all_parents = node.get_all_parents()
-
-            if all_parents:
-                del all_parents[-1]
-                all_parents.insert(0, node)
-
-            for i, parent in enumerate(all_parents):
-                if i == 0:
-                    if parent.get_next_sibling():
-                        lane = f"├{'─' * indent}{spacer}"
-                    else:
-                        lane = f"└{'─' * indent}{spacer}"
-                else:
-                    if parent.get_next_sibling():
-                        lane = f"│{spacer * indent}{spacer}"
-                    else:
-                        lane = f"{spacer}{spacer * indent}{spacer}"
+    def view_lines(self, indent=1, relative=False, custom_repr=None, spacer=" "):
+        """ Generator yielding the lines of `view` in a single walk, keeping a prefix of lanes for each depth.
+            Hides additional lines of a node's repr.
 
-                lanes.insert(0, lane)
+            :param indent: Width of lanes.
+            :param relative: Draw this Node as the root, otherwise lanes of it's parents are drawn too.
+            :param custom_repr: Optional function taking a node and returning what to draw instead of str(node).
+            :param spacer: Character to fill lanes with. """
+        branch, last_branch = f"├{'─' * indent}{spacer}", f"└{'─' * indent}{spacer}"
+        lane, last_lane = f"│{spacer * indent}{spacer}", f"{spacer}{spacer * indent}{spacer}"
 
+        def _line(node, prefix):
             node_str = str(custom_repr(node) if custom_repr else node)
             if "\n" in node_str:
                 node_str = f"{node_str.splitlines()[0]} ..."
-            lines.append(f"{''.join(lanes)}{node_str}")
+            return f"{prefix}{node_str}"
 
-        if relative:
-            top.remove()
+        if relative or self._parent is None:
+            yield _line(self, "")
+            prefix = ""
+        else:
+            lanes = []
+            parent = self._parent
+            while parent._parent is not None:
+                lanes.append(lane if parent.get_next_sibling() else last_lane)
+                parent = parent._parent
+            prefix = "".join(reversed(lanes))
+            is_last = self.get_next_sibling() is None
+            yield _line(self, f"{prefix}{last_branch if is_last else branch}")
+            prefix = f"{prefix}{last_lane if is_last else lane}"
+
+        stack = [[self._children, 0, prefix]]
+        while stack:
+            item = stack[-1]
+            children, i, prefix = item
+            if i == len(children):
+                stack.pop()
+                continue
+            item[1] = i + 1
+
+            node = children[i]
+            is_last = i + 1 == len(children)
+            yield _line(node, f"{prefix}{last_branch if is_last else branch}")
+            if node._children:
+                stack.append([node._children, 0, f"{prefix}{last_lane if is_last else lane}"])
+
+    def view(self, indent=1, relative=False, custom_repr=None, spacer=" ", print_out=True, file=None):
+        """ Get a printable string showing a clear view of this TreeDiagram structure.
+            Hides additional lines of a node's repr.
+            See `view_lines` for parameters.
+
+            :param print_out: Whether to print the returned string.
+            :param file: Optional file object to write lines to one by one instead, returns None if given. """
+        lines = self.view_lines(indent=indent, relative=relative, custom_repr=custom_repr, spacer=spacer)
+        if file is not None:
+            for line in lines:
+                file.write(f"{line}\n")
+            return None
 
         view = "\n".join(lines)
         if print_out:
@@ -488,6 +762,11 @@ class TreeDiagram:
         if key in self.data_keys:
             old_value = self.data.get(key)
             self.data[key] = value
+
+            parent = getattr(self, "_parent", None)
+            if parent is not None and any(keyInfo.unique for keyInfo in self.data_keys if keyInfo == key):
+                parent._unindex_unique(child=self, key=key, value=old_value)
+                parent._index_unique(child=self, key=key, value=value)
             self.hook_set_attribute(key=key, value=value, old_value=old_value)
         object.__setattr__(self, key, value)
 
@@ -526,7 +805,7 @@ class Markdown(TreeDiagram):
         """ Get a list of all lines in this section. """
         lines = self.lines.copy()
         if self.header:
-            lines.insert(0, f"{'#' * clamp(1 + len(self.get_all_parents()), 1, 6)} {self.header}")
+            lines.insert(0, f"{'#' * clamp(1 + self.depth, 1, 6)} {self.header}")
         return lines
 
     def add_lines(self, *lines):
@@ -543,7 +822,7 @@ class Markdown(TreeDiagram):
 
             :rtype: list[str] """
         lines = []
-        for markdown in self.get_all():
+        for markdown in self.iter_all():
             if lines:
                 lines.append("")
             lines.extend(markdown.section_lines())
@@ -555,8 +834,8 @@ class Markdown(TreeDiagram):
         return self
     
     def add_table_lines(self, *dicts):
-        """ Add a table to the lines using pandas `to_markdown`. """
-        self.add_lines(pandas.DataFrame(dicts).to_markdown(index=False).replace("_", "\\_"))
+        """ Add a table to the lines using `markdown_table`. """
+        self.add_lines(markdown_table(dicts).replace("_", "\\_"))
         return self
     
     def add_list_lines(self, *items, indent=0):
@@ -1,12 +1,15 @@
 import inspect
 import re
 import functools
-import pandas as pd
-
-
-def deco_cache():
-    """ Enable caching for a method or function. """
-    return functools.lru_cache()
+import itertools
+import os
+import statistics
+import time
+import math
+import operator
+import weakref
+from types import MappingProxyType
+from collections import deque
 
 
 class classproperty:
@@ -22,6 +25,189 @@ class classproperty:
         return self.fget(owner_cls)
 
 
+class SignatureSpec:
+    """
+    Immutable reflection of a callable's signature.
+    Computed once per callable through `SignatureSpec.get` and shared by every SigInfo of that callable.
+    Specs are stored weakly so they go away together with their callable.
+    Bound methods are stored by their `__func__` as a new bound method object is created on every attribute access.
+    A `self` parameter without default defaults to the callable itself, SigInfo fills it in as the spec only stores `selfDefault`.
+    """
+    _cache = weakref.WeakKeyDictionary()
+    _bound_cache = weakref.WeakKeyDictionary()
+
+    __slots__ = ("parameters", "names", "names_set", "indexes", "defaults", "selfDefault", "packedArgsName", "packedKwargsName", "leadingArgNames",
+                 "positionalArgNames", "positionalOnlyArgNames", "positionalOppositeArgNames", "namesWithoutDefaults",
+                 "namesRequired", "namesWithoutPacked", "positional_extra")
+
+    def __init__(self, callableObject):
+        parameters = tuple(inspect.signature(callableObject).parameters.values())
+        names = tuple(param.name for param in parameters)
+
+        defaults = {param.name: param.default for param in parameters if param.default is not param.empty}
+        selfDefault = "self" in names and "self" not in defaults  # Callable itself is default, not stored to keep the key weak
+
+        packedArgsName = next((param.name for param in parameters if param.kind is param.VAR_POSITIONAL), None)
+        packedKwargsName = next((param.name for param in parameters if param.kind is param.VAR_KEYWORD), None)
+        packed = (packedArgsName, packedKwargsName)
+        hasDefault = lambda name: name in defaults or (selfDefault and name == "self")
+
+        leadingArgNames = []
+        for param in parameters:
+            if param.name == "self":
+                continue
+            if param.default is not param.empty or param.kind not in (param.POSITIONAL_OR_KEYWORD, param.POSITIONAL_ONLY):
+                break
+            leadingArgNames.append(param.name)
+
+        positionalArgNames = tuple(param.name for param in parameters if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD, param.VAR_POSITIONAL))
+
+        try:
+            positional_extra = tuple(inspect.getfullargspec(callableObject).args)  # Cannot handle @deco_cached
+        except TypeError:
+            positional_extra = positionalArgNames
+
+        set_ = lambda key, value: object.__setattr__(self, key, value)
+        set_("parameters", parameters)
+        set_("names", names)
+        set_("names_set", frozenset(names))
+        set_("indexes", MappingProxyType({name: i for i, name in enumerate(names)}))
+        set_("defaults", MappingProxyType(defaults))
+        set_("selfDefault", selfDefault)
+        set_("packedArgsName", packedArgsName)
+        set_("packedKwargsName", packedKwargsName)
+        set_("leadingArgNames", tuple(leadingArgNames))
+        set_("positionalArgNames", positionalArgNames)
+        set_("positionalOnlyArgNames", tuple(param.name for param in parameters if param.kind in (param.POSITIONAL_ONLY, param.VAR_POSITIONAL)))
+        set_("positionalOppositeArgNames", tuple(name for name in names if name not in positionalArgNames))
+        set_("namesWithoutDefaults", tuple(name for name in names if not hasDefault(name)))
+        set_("namesRequired", tuple(name for name in names if not hasDefault(name) and name not in packed))
+        set_("namesWithoutPacked", tuple(name for name in names if name not in packed))
+        set_("positional_extra", positional_extra)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self} is immutable.")
+
+    @classmethod
+    def get(cls, callableObject):
+        """ Return the shared spec of a callable, creating it the first time.
+            Callables that cannot be weakly referenced get a new uncached spec.
+
+            :rtype: SignatureSpec """
+        if inspect.ismethod(callableObject):
+            cache, key = cls._bound_cache, callableObject.__func__
+        else:
+            cache, key = cls._cache, callableObject
+
+        try:
+            return cache[key]
+        except KeyError:
+            spec = cache[key] = cls(callableObject)
+            return spec
+        except TypeError:  # Not weakly referenceable or not hashable
+            return cls(callableObject)
+
+    def __repr__(self):
+        return f"<SignatureSpec with names '{', '.join(self.names)}'>"
+
+
+class SigBinder:
+    """
+    Specialized argument binder for a single callable, returned by `SigInfo.compile`.
+    `bind` and `unpack` are generated straight-line functions giving the same results as SigInfo's
+    `allArgs`, `unpackedArgs` and `unpackedKwargs` without any loops over the signature.
+    Compile once and reuse, every compile generates new code.
+    Callables with more than `max_generated` parameters use SigInfo instead of generated code.
+    """
+    max_generated = 255
+
+    def __init__(self, callableObject):
+        assert callable(callableObject)
+
+        self.callableObject = callableObject
+        self.spec = SignatureSpec.get(callableObject)
+
+        if len(self.spec.names) > self.max_generated:
+            self.bind = self._bind_fallback
+            self.unpack = self._unpack_fallback
+            return
+
+        namespace = {"_callableObject": callableObject}
+        source = f"{self._bind_source(namespace)}\n{self._unpack_source(namespace)}"
+        exec(compile(source, f"<SigBinder for {getattr(callableObject, '__qualname__', callableObject)}>", "exec"), namespace)
+
+        self.bind = namespace["bind"]
+        self.unpack = namespace["unpack"]
+
+    def _default_name(self, name, namespace):
+        """ Put default value of a parameter in namespace and return it's variable name, or None if it has no default. """
+        if name in self.spec.defaults:
+            var = f"_default_{self.spec.indexes[name]}"
+            namespace[var] = self.spec.defaults[name]
+            return var
+        if name == "self" and self.spec.selfDefault:
+            return "_callableObject"
+
+    def _get_source(self, name, namespace):
+        """ Source of SigInfo.__getitem__ for a parameter. """
+        var = self._default_name(name=name, namespace=namespace)
+        return f"get({name!r}, {var})" if var else f"get({name!r})"
+
+    def _bind_source(self, namespace):
+        spec = self.spec
+        defaults = ", ".join(f"{name!r}: {self._default_name(name=name, namespace=namespace)}" for name in spec.defaults)
+        lines = ["def bind(*args, **kwargs):", f"    allArgs = {{{defaults}}}"]
+        names = tuple(name for name in spec.positionalArgNames if name != spec.packedArgsName)  # *args is always last
+        if names:
+            namespace["_positionalNames"] = names
+            lines.extend(["    if args:", "        allArgs.update(zip(_positionalNames, args))"])
+        if spec.packedArgsName:
+            lines.extend([f"    if len(args) > {len(names)}:", f"        allArgs[{spec.packedArgsName!r}] = list(args[{len(names)}:])"])
+        lines.extend(["    if kwargs:", "        allArgs.update(kwargs)"])
+        if spec.selfDefault:
+            lines.extend(["    if 'self' not in allArgs:", "        allArgs['self'] = _callableObject"])
+        lines.append("    return allArgs")
+        return "\n".join(lines) + "\n"
+
+    def _unpack_return_source(self, positionalOnlyArgNames, namespace):
+        spec = self.spec
+        args = ", ".join("*packedArgs" if name == spec.packedArgsName else self._get_source(name=name, namespace=namespace) for name in positionalOnlyArgNames)
+        if spec.packedKwargsName:
+            var = f"_positional_{len(positionalOnlyArgNames)}"
+            namespace[var] = frozenset(positionalOnlyArgNames)
+            kwargs = f"{{key: value for key, value in allArgs.items() if key not in {var}}}"
+        else:
+            kwargs = ", ".join(f"{name!r}: {self._get_source(name=name, namespace=namespace)}" for name in spec.names if name not in positionalOnlyArgNames)
+            kwargs = f"{{{kwargs}}}"
+        return f"return [{args}], {kwargs}"
+
+    def _unpack_source(self, namespace):
+        spec = self.spec
+        lines = ["def unpack(allArgs):", "    get = allArgs.get"]
+        if spec.packedArgsName:
+            lines.append(f"    packedArgs = get({spec.packedArgsName!r}, [])")
+            lines.append("    if packedArgs:")
+            lines.append(f"        {self._unpack_return_source(positionalOnlyArgNames=spec.positionalArgNames, namespace=namespace)}")
+        lines.append(f"    {self._unpack_return_source(positionalOnlyArgNames=spec.positionalOnlyArgNames, namespace=namespace)}")
+        return "\n".join(lines) + "\n"
+
+    def _bind_fallback(self, /, *args, **kwargs):
+        return SigInfo(self.callableObject, *args, **kwargs).allArgs
+
+    def _unpack_fallback(self, allArgs):
+        sigInfo = SigInfo(self.callableObject)
+        sigInfo.allArgs = allArgs
+        return sigInfo.unpackedArgs, sigInfo.unpackedKwargs
+
+    def call(self, /, *args, **kwargs):
+        """ Bind and call callableObject, same as `SigInfo(callableObject, *args, **kwargs).call()`. """
+        args, kwargs = self.unpack(self.bind(*args, **kwargs))
+        return self.callableObject(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<SigBinder for '{self.callableObject.__class__.__name__}' with names '{', '.join(self.spec.names)}'>"
+
+
 class SigInfo:
     """
     Handles a callable along with it's parameters.
@@ -29,20 +215,25 @@ class SigInfo:
     Parameters can be changed but not callableObject.
     Args are unpacked to allArgs using parameters of callableObject.
     If there's a *packedParameter then it's stored as a list inside allArgs.
-    TODO: Add caching for SigInfo's signature methods
+    Signature reflection is shared between instances through SignatureSpec.
     """
     def __init__(self, /, callableObject, *args, **kwargs):  # / to end positional only characters, allows us to have "self" in kwargs for unbound methods
         assert callable(callableObject)
 
         self._callableObject = callableObject
-        self.allArgs = {**self.defaults, **self._argsToKwargs(args), **kwargs}
+        self._spec = SignatureSpec.get(callableObject)
+        self.allArgs = {**self._spec.defaults, **self._argsToKwargs(args), **kwargs}
+        if self._spec.selfDefault and "self" not in self.allArgs:
+            self.allArgs["self"] = callableObject
 
     def _argsToKwargs(self, args):
         kwargs = {}
-        for i, (name, arg) in enumerate(zip(self.positionalArgNames, args)):
-            if name == self.packedArgsName:
+        positionalArgNames = self._spec.positionalArgNames
+        packedArgsName = self._spec.packedArgsName
+        for i, (name, arg) in enumerate(zip(positionalArgNames, args)):
+            if name == packedArgsName:
                 kwargs[name] = list(args[i:])
-                assert i + 1 == len(self.positionalArgNames)  # Make sure this is last iteration becuse *args should be last
+                assert i + 1 == len(positionalArgNames)  # Make sure this is last iteration becuse *args should be last
             else:
                 kwargs[name] = arg
         return kwargs
@@ -52,6 +243,13 @@ class SigInfo:
         """ Propertize to protect but still have public. """
         return self._callableObject
 
+    @property
+    def spec(self):
+        """ Get the shared SignatureSpec of callableObject.
+
+            :rtype: SignatureSpec """
+        return self._spec
+
     def class_from_callable(self, meth=None):
         """ Return class that owns given method, or given callable from initiating SigInfo.
 
@@ -78,76 +276,56 @@ class SigInfo:
     def positional_extra(self):
         """ Get a list of the positional parameter names, including self or cls.
             A bit sketchy. """
-        try:
-            return inspect.getfullargspec(self.callableObject).args  # Cannot handle @deco_cached
-        except TypeError:
-            return self.positionalArgNames
+        return list(self._spec.positional_extra)
 
     @property
     def parameters(self):
         """ Get list of inspect parameter objects. """
-        return list(inspect.signature(self.callableObject).parameters.values())
+        return list(self._spec.parameters)
 
     @property
     def names(self):
         """ Get list of parameter names. """
-        return [param.name for param in self.parameters]
+        return list(self._spec.names)
 
     @property
     def namesWithoutDefaults(self):
         """ Get list of parameter names except those ones that have a default value. """
-        return [name for name in self.names if name not in self.defaults]
+        return list(self._spec.namesWithoutDefaults)
 
     @property
     def namesRequired(self):
         """ Get list of parameter that have to be defined, i.e. non-packed without default value. """
-        return [name for name in self.names if name not in list(self.defaults.keys()) + [self.packedArgsName, self.packedKwargsName]]
+        return list(self._spec.namesRequired)
 
     @property
     def namesWithoutPacked(self):
         """ Get list of parameter names except *args or **kwargs. """
-        return [name for name in self.names if name not in (self.packedArgsName, self.packedKwargsName)]
+        return list(self._spec.namesWithoutPacked)
 
     @property
     def leadingArgNames(self):
         """ Get names leading args that don't have default value.
             '*args' wont be included.
             'self' wont be included. """
-        leadingArgNames = []
-        for param in self.parameters:
-            if param.name == "self":
-                continue
-
-            noDefault = param.default is inspect.Parameter.empty
-            includedKind = param.kind.name in ("POSITIONAL_OR_KEYWORD", "POSITIONAL_ONLY")
-            if not (noDefault and includedKind):
-                break
-
-            leadingArgNames.append(param.name)
-        return leadingArgNames
+        return list(self._spec.leadingArgNames)
 
     @property
     def packedArgsName(self):
         """ Get name of packed *args or None. """
-        for param in self.parameters:
-            if param.kind.name == "VAR_POSITIONAL":
-                return param.name
+        return self._spec.packedArgsName
 
     @property
     def packedKwargsName(self):
         """ Get name of packed *kwargs or None. """
-        for param in self.parameters:
-            if param.kind.name == "VAR_KEYWORD":
-                return param.name
+        return self._spec.packedKwargsName
 
     @property
     def defaults(self):
         """ Get dict of default values. """
-        d = {param.name: param.default for param in self.parameters if param.default is not param.empty}
-
-        if "self" in self.names and "self" not in d:
+        d = dict(self._spec.defaults)
+        if self._spec.selfDefault:
             d["self"] = self.callableObject
-
         return d
 
     @property
@@ -155,15 +333,16 @@ class SigInfo:
         """ Get list of parameter names that can ONLY take a positional argument.
             Note - Can be changed dynamically: If packedArgs isn't None then all `POSITIONAL_OR_KEYWORD` are included. """
         if self.packedArgs:
-            return self.positionalArgNames
+            return list(self._spec.positionalArgNames)
         else:
-            return [param.name for param in self.parameters if param.kind.name in ("POSITIONAL_ONLY", "VAR_POSITIONAL")]
+            return list(self._spec.positionalOnlyArgNames)
 
     @property
     def positionalOnlyOppositeArgNames(self):
         """ Get list of parameter names that CAN take a keyword argument.
             Opposite of `self.poisitionalOnlyArgNames`. """
-        return [name for name in self.names if name not in self.positionalOnlyArgNames]
+        positionalOnlyArgNames = self.positionalOnlyArgNames
+        return [name for name in self._spec.names if name not in positionalOnlyArgNames]
 
 
     @property
@@ -172,7 +351,7 @@ class SigInfo:
         Get list of parameter names that CAN take a positional argument.
         `*args` included but is always last if it exists.
         """
-        return [param.name for param in self.parameters if param.kind.name in ("POSITIONAL_ONLY", "POSITIONAL_OR_KEYWORD", "VAR_POSITIONAL")]
+        return list(self._spec.positionalArgNames)
 
     @property
     def positionalOppositeArgNames(self):
@@ -181,30 +360,33 @@ class SigInfo:
         Opposite of `self.positionalArgNames`.
         `**kwargs` included but is always last if it exists.
         """
-        return [name for name in self.names if name not in self.positionalArgNames]
+        return list(self._spec.positionalOppositeArgNames)
 
     def getIndexFromName(self, name):
         """ Get index from name if name exists, else None. """
-        if name in self.names:
-            return self.names.index(name)
+        return self._spec.indexes.get(name)
 
     # ========= Level 2 =========
     @property
     def packedArgs(self):
         """ Return a list of values in packed args parameter, empty list if there are no packed args. """
-        return self.allArgs.get(self.packedArgsName, [])
+        return self.allArgs.get(self._spec.packedArgsName, [])
 
     @property
     def packedKwargs(self):
         """ Return a dict of values in packed kwargs parameter, empty dict if there are no packed kwargs. """
-        return {key: value for key, value in self.allArgs.items() if self.packedKwargsName and key not in self.names}
+        if not self._spec.packedKwargsName:
+            return {}
+        names_set = self._spec.names_set
+        return {key: value for key, value in self.allArgs.items() if key not in names_set}
 
     @property
     def unpackedArgs(self):
         """ Extract a list of all positional ONLY parameters for callable. """
         args = []
+        packedArgsName = self._spec.packedArgsName
         for name in self.positionalOnlyArgNames:
-            if name == self.packedArgsName:
+            if name == packedArgsName:
                 args.extend(self.packedArgs)
             else:
                 args.append(self[name])
@@ -213,8 +395,9 @@ class SigInfo:
     @property
     def unpackedKwargs(self):
         """ Extract a dict of key words that callable can take. """
-        if self.packedKwargsName:  # Give everything except possible positional only arguments
-            return {key: value for key, value in self.allArgs.items() if key not in self.positionalOnlyArgNames}
+        if self._spec.packedKwargsName:  # Give everything except possible positional only arguments
+            positionalOnlyArgNames = self.positionalOnlyArgNames
+            return {key: value for key, value in self.allArgs.items() if key not in positionalOnlyArgNames}
         else:  # Return every parameter except positional only
             return {key: self[key] for key in self.positionalOnlyOppositeArgNames}
 
@@ -222,7 +405,10 @@ class SigInfo:
 
     def __getitem__(self, name):
         """ Get value of a parameter from allArgs, otherwise None. """
-        return self.allArgs.get(name, self.defaults.get(name, None))
+        try:
+            return self.allArgs[name]
+        except KeyError:
+            return self.defaults.get(name, None)
 
     def __setitem__(self, name, value):
         """ Can set single keyword argument or entire *args."""
@@ -236,8 +422,59 @@ class SigInfo:
         else:
             return self.callableObject(*self.unpackedArgs, **self.unpackedKwargs)
 
+    def call_many(self, mappings, executor=None, ordered=True, window=None):
+        """ Generator calling callableObject once for each mapping of parameter names to values, yielding results.
+            Each mapping updates a copy of allArgs, arguments are unpacked with one SigBinder made per call.
+            Mappings are consumed lazily, with an executor at most `window` calls are in flight at a time.
+
+            :param collections.Iterable[dict] mappings: Iterable of dicts like allArgs.
+            :param concurrent.futures.Executor executor: Optional executor to submit calls to.
+            :param ordered: Yield results in order of mappings, otherwise in order of completion when using executor.
+            :param window: Max calls in flight, defaults to twice the executor's number of workers. """
+        unpack = SigBinder(self.callableObject).unpack
+        callableObject = self.callableObject
+        allArgs = self.allArgs
+
+        if executor is None:
+            for mapping in mappings:
+                args, kwargs = unpack({**allArgs, **mapping})
+                yield callableObject(*args, **kwargs)
+            return
+
+        if window is None:
+            window = 2 * (getattr(executor, "_max_workers", None) or os.cpu_count() or 1)
+        mappings = iter(mappings)
+
+        def _submit(mapping):
+            args, kwargs = unpack({**allArgs, **mapping})
+            return executor.submit(callableObject, *args, **kwargs)
+
+        if ordered:
+            futures = deque(_submit(mapping) for mapping in itertools.islice(mappings, window))
+            while futures:
+                future = futures.popleft()
+                futures.extend(_submit(mapping) for mapping in itertools.islice(mappings, 1))
+                yield future.result()
+        else:
+            from concurrent.futures import FIRST_COMPLETED, wait
+
+            futures = {_submit(mapping) for mapping in itertools.islice(mappings, window)}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    futures.update(_submit(mapping) for mapping in itertools.islice(mappings, 1))
+                    yield future.result()
+
     # ========= Other =========
 
+    @staticmethod
+    def compile(callableObject):
+        """ Return a SigBinder with generated functions that bind and unpack arguments for callableObject.
+            Use it instead of SigInfo for hot callables when only binding and calling is needed.
+
+            :rtype: SigBinder """
+        return SigBinder(callableObject)
+
     def __repr__(self):
         return f"<SigInfo for '{self.callableObject.__class__.__name__}' with names '{', '.join(self.names)}'>"
 
@@ -253,15 +490,13 @@ def _tokenize(expression):
     return re.findall(r"(\b\w*[.]?\w+\b|[()+*\-/])", expression)
 
 
-def calculate(expression, *args):
-    """
-    Automatically fills variables of a formula in a string then evaluates it.
-    Enter args in the order that they appear.
-    """
-    seenArgs = {}
+@functools.lru_cache(maxsize=256)
+def _compile_expression(expression, vectorized=False):
+    """ Return a function taking variables of an expression by position in the order that they appear.
+        Compiled functions are cached by expression text. """
+    names = []
     newTokens = []
-    tokens = _tokenize(expression)
-    for token in tokens:
+    for token in _tokenize(expression):
         try:
             float(token)
         except ValueError:
@@ -272,10 +507,49 @@ def calculate(expression, *args):
         if token in ignore or tokenIsFloat:
             newTokens.append(token)
         else:
-            if token not in seenArgs:
-                seenArgs[token] = str(args[len(seenArgs)])
-            newTokens.append(seenArgs[token])
-    return eval("".join(newTokens))
+            if token not in names:
+                names.append(token)
+            newTokens.append(f"_{names.index(token)}")
+
+    if vectorized:
+        import numpy
+        namespace = {"sqrt": numpy.sqrt}
+    else:
+        namespace = {"sqrt": math.sqrt}
+    parameters = ", ".join(f"_{i}" for i in range(len(names)))
+    source = "".join(f" {token}" if token[-1].isalnum() or token[-1] == "_" else token for token in newTokens)
+    return eval(f"lambda {parameters}: {source}", namespace)
+
+
+def calculate(expression, *args):
+    """
+    Automatically fills variables of a formula in a string then evaluates it.
+    Enter args in the order that they appear.
+    Args are passed as values to a cached compiled expression, extra args are ignored.
+    """
+    func = _compile_expression(expression)
+    return func(*args[:func.__code__.co_argcount])
+
+
+def calculate_many(expression, *arrays, rows=None):
+    """
+    Evaluate an expression for many values in one pass.
+    Give one array per variable in the order that they appear, evaluated as NumPy arrays if NumPy is installed, otherwise returns a list.
+    Or give `rows` as an iterable of argument tuples to get a list of results.
+    """
+    if rows is not None:
+        func = _compile_expression(expression)
+        n = func.__code__.co_argcount
+        return [func(*row[:n]) for row in rows]
+
+    try:
+        import numpy
+    except ImportError:
+        func = _compile_expression(expression)
+        return [func(*row) for row in zip(*arrays)]
+
+    func = _compile_expression(expression, vectorized=True)
+    return func(*(numpy.asarray(array) for array in arrays[:func.__code__.co_argcount]))
 
 
 def defaults(dictionary, overwriteNone=False, **kwargs):
@@ -302,21 +576,38 @@ def defaults(dictionary, overwriteNone=False, **kwargs):
 class Operators:
     """Automatic operator definitions for classes."""
     comparisons = {
-        "__eq__": lambda a, b: a == b,
-        "__gt__": lambda a, b: a > b,
-        "__lt__": lambda a, b: a < b,
-        "__ge__": lambda a, b: a >= b,
-        "__le__": lambda a, b: a <= b,
+        "__eq__": operator.eq,
+        "__gt__": operator.gt,
+        "__lt__": operator.lt,
+        "__ge__": operator.ge,
+        "__le__": operator.le,
     }
 
+    @staticmethod
+    def _operand_caller(func):
+        """ Inspect a left or right lambda once and return a function taking `left` and `right` that calls it. """
+        names = SignatureSpec.get(func).names
+        if names == ("left", ):
+            return lambda left, right: func(left)
+        elif names == ("right", ):
+            return lambda left, right: func(right)
+        elif names == ("left", "right"):
+            return func
+        binder = SigBinder(func)
+        return lambda left, right: binder.call(left=left, right=right)
+
     @classmethod
-    def deco_define_comparisons(cls, leftLambda, rightLambda):
+    def deco_define_comparisons(cls, leftLambda, rightLambda, cache_right=False, hashable=False):
         """
         Define all comparision operators for this class.
         Provide two functions that return left and right values.
-        Automatically fills 'left' and 'right' parameters by name.
+        Automatically fills 'left' and 'right' parameters by name, the lambdas are inspected once when decorating.
         Will make class instances unhashable as the `__eq__` method is defined without defining `__hash__`.
 
+        :param cache_right: Store right value in instances of this class the first time it's computed, only for immutable instances with a rightLambda only taking `right`.
+        :param hashable: Define `__hash__` using the left value, which has to equal the right value of the same instance.
+            Don't combine with a rightLambda that lets instances equal other types, their hashes would differ.
+
         Stubs:
             def __eq__(self, other): ...
             def __gt__(self, other): ...
@@ -324,42 +615,176 @@ class Operators:
             def __ge__(self, other): ...
             def __le__(self, other): ...
         """
+        left_caller = cls._operand_caller(leftLambda)
+        right_caller = cls._operand_caller(rightLambda)
+
         def wrapper(baseCls):
             """."""
+            right_key = right_caller
+            if cache_right and SignatureSpec.get(rightLambda).names == ("right", ):
+                def right_key(left, right):
+                    if isinstance(right, baseCls):
+                        try:
+                            return right.__dict__["_operators_right"]
+                        except (AttributeError, KeyError):
+                            value = right_caller(left, right)
+                            try:
+                                right.__dict__["_operators_right"] = value
+                            except AttributeError:
+                                pass
+                            return value
+                    return right_caller(left, right)
+
             for name, func in cls.comparisons.items():
+                def comparison(left, right, func=func):
+                    return func(left_caller(left, right), right_key(left, right))
+                comparison.__name__ = comparison.__qualname__ = name
+                setattr(baseCls, name, comparison)
 
-                lambdaFunc = lambda left, right, func=func: func(
-                    SigInfo(leftLambda, left=left, right=right).call(),
-                    SigInfo(rightLambda, left=left, right=right).call())
-                setattr(baseCls, name, lambdaFunc)
+            if hashable:
+                setattr(baseCls, "__hash__", lambda self: hash(left_caller(self, None)))
 
             return baseCls
         return wrapper
 
 
+def _compile_binds_cleanly(spec, missing_ok=False):
+    """ Return a function taking args and kwargs that returns whether calling directly with them binds exactly like SigBinder does.
+        That is no extra or unknown args, no keyword given twice and no missing required parameter.
+
+        :param missing_ok: Don't check for missing required parameters. """
+    positionalIndexes = {name: i for i, name in enumerate(spec.positionalArgNames) if name != spec.packedArgsName}
+    maxPositional = None if spec.packedArgsName else len(positionalIndexes)
+    keywordNames = frozenset(param.name for param in spec.parameters if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY))
+    names_set = spec.names_set if spec.packedKwargsName else None
+    required = () if missing_ok else tuple((name, positionalIndexes.get(name, len(spec.names))) for name in spec.names
+                                           if name not in spec.defaults and name not in (spec.packedArgsName, spec.packedKwargsName))
+
+    def binds_cleanly(args, kwargs):
+        n = len(args)
+        if maxPositional is not None and n > maxPositional:
+            return False
+        for name in kwargs:
+            if name in keywordNames:
+                if positionalIndexes.get(name, n) < n:
+                    return False
+            elif names_set is None or name in names_set:
+                return False
+        for name, index in required:
+            if index >= n and name not in kwargs:
+                return False
+        return True
+    return binds_cleanly
+
+
 def deco_cast_parameters(**pars_to_cast):
     """ Decorator to make sure `path` parameter is a Path.
-        Example: @deco_cast_paramters(x=int, y=Vec2) """
+        Example: @deco_cast_paramters(x=int, y=Vec2)
+        Parameter positions and type checks are prepared when decorating.
+        If no parameter needs casting and the arguments bind cleanly then the function is called directly with them,
+        otherwise they are rebound like SigInfo does, dropping unknown args and filling missing ones with None. """
     def _decorator(function):
-        def _wrapper(*args, **kwargs):
-            sigInfo = SigInfo(function, *args, **kwargs)
+        spec = SignatureSpec.get(function)
+        binder = SigBinder(function)
+        binds_cleanly = _compile_binds_cleanly(spec)
+
+        plan = []
+        for par_name, cls in pars_to_cast.items():
+            if par_name not in spec.names_set:
+                raise AttributeError(f"Function does not have a `{par_name}` parameter.")
+            try:
+                checker = compileTypeChecker(cls)
+            except TypeError:  # Not a type, always cast like `typeChecker` would
+                checker = lambda value: False
+
+            param = spec.parameters[spec.indexes[par_name]]
+            packed = param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+            index = spec.positionalArgNames.index(par_name) if par_name in spec.positionalArgNames and not packed else None
+            keyword = param.kind not in (param.POSITIONAL_ONLY, param.VAR_POSITIONAL, param.VAR_KEYWORD)
+            default = binder.bind().get(par_name)
+            plan.append((par_name, cls, checker, packed, index, keyword, default))
 
-            for par_name, cls in pars_to_cast.items():
-                if par_name not in sigInfo.names:
-                    raise AttributeError(f"Function does not have a `{par_name}` parameter.")
-                if not typeChecker(sigInfo[par_name], cls, error=False):
-                    sigInfo[par_name] = cls(sigInfo[par_name])
-
-            return sigInfo.call()
+        def _wrapper(*args, **kwargs):
+            for par_name, cls, checker, packed, index, keyword, default in plan:
+                if packed:
+                    break
+                elif index is not None and index < len(args):
+                    value = args[index]
+                elif keyword and par_name in kwargs:
+                    value = kwargs[par_name]
+                else:
+                    value = default
+                if not checker(value):
+                    break
+            else:
+                if binds_cleanly(args, kwargs):
+                    return function(*args, **kwargs)
+
+            allArgs = binder.bind(*args, **kwargs)
+            for par_name, cls, checker, *_ in plan:
+                value = allArgs.get(par_name)
+                if not checker(value):
+                    allArgs[par_name] = cls(value)
+            args, kwargs = binder.unpack(allArgs)
+            return function(*args, **kwargs)
         return _wrapper
     return _decorator
 
 
+def _deco_default_self_args_source(spec):
+    """ Return source of a wrapper for deco_default_self_args, or None if the signature isn't supported.
+        Wrapper takes all named parameters as positional or keyword and drops unknown args, like SigInfo does. """
+    if not spec.positionalArgNames or spec.positionalArgNames[0] != "self" or any(name.startswith("_deco_") for name in spec.names):
+        return None
+
+    wrapper_pars, call_pars, lines = [], [], []
+    for i, param in enumerate(spec.parameters):
+        name = param.name
+        if param.kind is param.VAR_POSITIONAL:
+            wrapper_pars.append(f"*{name}")
+            call_pars.append(f"*{name}")
+            continue
+        if param.kind is param.VAR_KEYWORD:
+            continue
+        if param.kind is param.KEYWORD_ONLY and not spec.packedArgsName and "*_deco_args" not in wrapper_pars:
+            wrapper_pars.append("*_deco_args")
+
+        if name == "self":
+            default = "_deco_func"
+        elif name in spec.namesRequired:
+            default = "_deco_missing"
+            lines.extend([
+                f"    if {name} is _deco_missing:",
+                "        try:",
+                f"            {name} = self.{name}",
+                "        except AttributeError:",
+                f"            raise AttributeError(f\"Missing attribute '{name}' for instance '{{self}}'.\")",
+            ])
+        else:
+            default = f"_deco_default_{i}"
+        wrapper_pars.append(f"{name}={default}")
+        call_pars.append(name if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD) else f"{name}={name}")
+
+    if not spec.packedArgsName and "*_deco_args" not in wrapper_pars:
+        wrapper_pars.append("*_deco_args")
+    if spec.packedKwargsName:
+        wrapper_pars.append(f"**{spec.packedKwargsName}")
+        call_pars.append(f"**{spec.packedKwargsName}")
+    else:
+        wrapper_pars.append("**_deco_kwargs")
+
+    lines.insert(0, f"def _wrapper({', '.join(wrapper_pars)}):")
+    lines.append(f"    return _deco_func({', '.join(call_pars)})")
+    return "\n".join(lines) + "\n"
+
+
 def deco_default_self_args(func):
     """ As an alternative to setting each and every parameter's default value to `None` for a method.
         Automatically sets each undefined parameter to self's attribute, which allows us to set a parameter `None`.
-        Note: Parameters names must match attributes in self. """
-    def _wrapper(*args, **kwargs):
+        Note: Parameters names must match attributes in self.
+        A wrapper with the same parameters is generated when decorating so that calls don't need any reflection,
+        keywords that don't bind cleanly, such as one also given positionally, go through SigInfo instead. """
+    def _sigInfo_wrapper(*args, **kwargs):
         sigInfo = SigInfo(func, *args, **kwargs)
 
         for required_parameter in sigInfo.namesRequired:
@@ -371,6 +796,22 @@ def deco_default_self_args(func):
                 sigInfo[required_parameter] = attr_value
 
         return sigInfo.call()
+
+    spec = SignatureSpec.get(func)
+    source = _deco_default_self_args_source(spec)
+    if source is None:
+        return _sigInfo_wrapper
+
+    namespace = {"__name__": func.__module__, "_deco_func": func, "_deco_missing": object()}
+    namespace.update({f"_deco_default_{spec.indexes[name]}": value for name, value in spec.defaults.items()})
+    exec(compile(source, f"<deco_default_self_args for {getattr(func, '__qualname__', func)}>", "exec"), namespace)
+    generated = namespace["_wrapper"]
+    binds_cleanly = _compile_binds_cleanly(spec, missing_ok=True)
+
+    def _wrapper(*args, **kwargs):
+        if kwargs and not binds_cleanly(args, kwargs):
+            return _sigInfo_wrapper(*args, **kwargs)
+        return generated(*args, **kwargs)
     return _wrapper
 
 
@@ -395,13 +836,57 @@ class EmptyContext:
         pass
 
 
+def _call_table_cell(func, arg, repeat):
+    """ Call func with arg and return result, or "-" if it raised.
+        If repeat is defined then the median seconds of that many calls is returned as well. """
+    try:
+        if not repeat:
+            return func(arg), None
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func(arg)
+            seconds.append(time.perf_counter() - start)
+        return result, statistics.median(seconds)
+    except Exception:
+        return "-", None
+
+
+def _format_seconds(seconds):
+    """ Format seconds with a fitting unit. """
+    if seconds is None:
+        return "-"
+    for unit, factor in (("s", 1), ("ms", 1e3), ("µs", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.3g} {unit}"
+    return f"{seconds * 1e9:.3g} ns"
+
+
 class CallTable:
-    """ Create a markdown table of functions and arguments. """
-    def __init__(self, name=None):
+    """ Create a markdown table of functions and arguments.
+
+        :param name: Name shown in top left cell.
+        :param parallel: Evaluate cells in a "thread" or "process" pool, processes require picklable funcs and args.
+        :param workers: Max workers of pool.
+        :param timeout: Max seconds each cell may run counted from when it starts, shown as "timeout". Uses a thread pool if parallel isn't defined.
+            Timed out cells cannot be stopped and keep running in the background as the pool is shut down without waiting,
+            cells still queued are moved to a new pool so that they aren't held back.
+            For processes a cell counts as started when it's sent to a worker process.
+        :param timing: Also generate a table with the median time of each cell.
+        :param repeat: Number of calls per cell to take the median time of when timing. """
+    _poll_seconds = 0.01
+
+    def __init__(self, name=None, parallel=None, workers=None, timeout=None, timing=False, repeat=5):
         self.name = name
+        self.parallel = parallel
+        self.workers = workers
+        self.timeout = timeout
+        self.timing = timing
+        self.repeat = repeat
 
         self.funcs = {}
         self.args = {}
+        self.timings = {}
 
     def set_funcs(self, **funcs):
         """ Set all funcs. """
@@ -413,30 +898,85 @@ class CallTable:
         self.args = args
         return self
 
+    def _evaluate(self, funcs, args):
+        """ Return a dict of cell names to (result, seconds). """
+        repeat = self.repeat if self.timing else None
+        cells = [(func_name, arg_name) for func_name in funcs for arg_name in args]
+
+        parallel = self.parallel
+        if parallel is None and self.timeout is not None:
+            parallel = "thread"
+        if parallel is None:
+            return {cell: _call_table_cell(funcs[cell[0]], args[cell[1]], repeat) for cell in cells}
+
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+        executor_cls = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}[parallel]
+        executors = []
+
+        def _submit(cells_):
+            executor = executor_cls(max_workers=self.workers)
+            executors.append(executor)
+            return {executor.submit(_call_table_cell, funcs[cell[0]], args[cell[1]], repeat): cell for cell in cells_}
+
+        try:
+            futures = _submit(cells)  # future: cell
+            started = {}  # future: seconds
+            results = {}
+            while futures:
+                wait_seconds = None
+                if self.timeout is not None:
+                    now = time.perf_counter()
+                    for future in futures:
+                        if future not in started and future.running():
+                            started[future] = now
+
+                    timed_out = [future for future in futures if future in started and not future.done() and now - started[future] >= self.timeout]
+                    if timed_out:
+                        for future in timed_out:
+                            results[futures.pop(future)] = ("timeout", None)
+                        queued = [future for future in futures if future not in started and future.cancel()]
+                        futures.update(_submit([futures.pop(future) for future in queued]))
+                        continue
+
+                    deadline = min((started[future] + self.timeout for future in futures if future in started), default=math.inf)
+                    wait_seconds = max(0, min(deadline - now, self._poll_seconds))
+
+                done, _ = wait(futures, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cell = futures.pop(future)
+                    try:
+                        results[cell] = future.result()
+                    except Exception:  # Such as pickling errors for processes
+                        results[cell] = ("-", None)
+            return {cell: results[cell] for cell in cells}
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=False)
+
+    def _markdown(self, columns):
+        """ Return a table with a row for each arg and a column for each func, from a dict of func names to dicts of arg names to cells. """
+        arg_names = dict.fromkeys(arg_name for cells in columns.values() for arg_name in cells)
+        name = "" if self.name is None else self.name
+        return markdown_table({name: arg_name, **{func_name: cells[arg_name] for func_name, cells in columns.items() if arg_name in cells}} for arg_name in arg_names)
+
     def _generate(self, funcs=None, args=None, print_out=True):
         if funcs is None:
             funcs = self.funcs
         if args is None:
             args = self.args
 
-        columns = {}
-        for func_name, func in funcs.items():
-            columns[func_name] = {}
-            for arg_name, arg in args.items():
-                # print(arg, getattr(arg, "__self__", None))
-                try:
-                    result = func(arg)
-                    if not result:
-                        result = ""
-                except Exception as e:
-                    # raise e
-                    result = "-"
-                columns[func_name][arg_name] = result
-
-        df = pd.DataFrame(columns)
-        df = df.rename_axis(self.name)
-
-        md = df.to_markdown()
+        columns = {func_name: {} for func_name in funcs}
+        timings = {func_name: {} for func_name in funcs}
+        for (func_name, arg_name), (result, seconds) in self._evaluate(funcs=funcs, args=args).items():
+            columns[func_name][arg_name] = result if result else ""
+            timings[func_name][arg_name] = seconds
+
+        md = self._markdown(columns)
+        if self.timing:
+            self.timings = timings
+            md = f"{md}\n\n{self._markdown({func_name: {arg_name: _format_seconds(seconds) for arg_name, seconds in cells.items()} for func_name, cells in timings.items()})}"
+
         if print_out:
             print(md, "\n")
         return md
@@ -454,7 +994,9 @@ class CallTable:
         return self._generate(funcs=funcs)
 
 
-from generallibrary.types_ import typeChecker
+from generallibrary.types_ import compileTypeChecker
+from generallibrary.cache import deco_cache
+from generallibrary.text import markdown_table
 
 
 
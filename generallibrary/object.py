@@ -2,34 +2,226 @@
 import sys
 from types import ModuleType, FunctionType
 from gc import get_referents
+from collections import namedtuple
+from itertools import islice
+import statistics
+import random
 import inspect
 
 
-def getsize(obj):
+class SizeReport(namedtuple("SizeReport", ("total", "objects", "breakdown", "truncated"))):
+    """ Result of `getsize_report`.
+        `total` is bytes, `objects` is the number of counted objects, `breakdown` maps labels to bytes
+        and `truncated` is True if a budget ran out before every referent was counted. """
+    __slots__ = ()
+
+
+_GETSIZE_BLACKLIST = type, ModuleType, FunctionType
+
+
+def _getsize_labeled_referents(obj):
+    """ Return a list of `(label, referent)` for keys and values of a dict, items of a list or tuple or attributes of an instance. """
+    if isinstance(obj, dict):
+        return [pair for key, value in obj.items() for pair in ((key, key), (key, value))]
+    elif isinstance(obj, (list, tuple)):
+        return list(enumerate(obj))
+
+    labeled = list(getattr(obj, "__dict__", {}).items())
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                labeled.append((name, getattr(obj, name)))
+    return labeled
+
+
+def getsize_report(*objs, max_objects=None, max_bytes=None, by="type"):
+    """ Get a sum of sizes in bytes of objects and all their referents along with a breakdown.
+        Referents shared by several objects are only counted once, attributed to the first object reaching them.
+        Buffer-backed objects like bytes, NumPy arrays and memoryviews are counted with `sys.getsizeof` which includes
+        their data if they own it, their contents are never walked. Views count the object owning their memory instead.
+        Modules, classes and functions are excluded unless given directly.
+
+        :param objs: Root objects.
+        :param int max_objects: Stop after counting this many objects.
+        :param int max_bytes: Stop once total reaches this many bytes.
+        :param str by: "type" for type names, "attribute" for attribute names, keys or indexes of the roots, "root" for root indexes or None for no breakdown.
+        :rtype: SizeReport """
+    if by not in ("type", "attribute", "root", None):
+        raise AttributeError(f"by has to be 'type', 'attribute', 'root' or None, not {by!r}")
+
+    max_objects = sys.maxsize if max_objects is None else max_objects
+    max_bytes = sys.maxsize if max_bytes is None else max_bytes
+    by_type = by == "type"
+    sizes = {}
+    seen_ids = set()
+    buffer_types = {memoryview: True}
+    total = objects = 0
+    truncated = False
+
+    def _walk(pending, label, referents=True):
+        """ Count every object in pending and their referents, returns False if a budget ran out. """
+        nonlocal total, objects, truncated
+        seen_add, getsizeof, blacklist, get_buffer_type = seen_ids.add, sys.getsizeof, _GETSIZE_BLACKLIST, buffer_types.get
+        stack = [pending]
+        while stack:
+            need_referents = []
+            bases = []
+            for obj in stack.pop():
+                if id(obj) in seen_ids or isinstance(obj, blacklist):
+                    continue
+                if objects >= max_objects or total >= max_bytes:
+                    truncated = True
+                    return False
+
+                seen_add(id(obj))
+                size = getsizeof(obj)
+                total += size
+                objects += 1
+                cls = type(obj)
+                if by:
+                    key = cls if by_type else label
+                    sizes[key] = sizes.get(key, 0) + size
+
+                is_buffer = get_buffer_type(cls)
+                if is_buffer is None:
+                    is_buffer = buffer_types[cls] = hasattr(cls, "nbytes")
+                if is_buffer:
+                    try:
+                        with memoryview(obj) as view:
+                            base = view.obj if cls is memoryview else getattr(obj, "base", None)
+                    except (TypeError, ValueError):
+                        need_referents.append(obj)
+                    else:
+                        if base is not None:
+                            bases.append(base)
+                else:
+                    need_referents.append(obj)
+
+            if not referents:
+                break
+            if bases:
+                stack.append(bases)
+            if need_referents:
+                stack.append(get_referents(*need_referents))
+        return True
+
+    for root_index, root in enumerate(objs):
+        if isinstance(root, _GETSIZE_BLACKLIST):
+            if id(root) not in seen_ids:
+                seen_ids.add(id(root))
+                total += sys.getsizeof(root)
+                objects += 1
+                if by:
+                    key = type(root) if by_type else (None if by == "attribute" else root_index)
+                    sizes[key] = sizes.get(key, 0) + sys.getsizeof(root)
+            continue
+
+        if by == "attribute":
+            if id(root) in seen_ids:
+                continue
+            if not _walk(pending=[root], label=None, referents=False):
+                break
+            if not all(_walk(pending=[referent], label=label) for label, referent in _getsize_labeled_referents(root)):
+                break
+            if not _walk(pending=get_referents(root), label=None):
+                break
+        elif not _walk(pending=[root], label=root_index):
+            break
+
+    if by_type:
+        breakdown = {}
+        for cls, size in sizes.items():
+            breakdown[cls.__name__] = breakdown.get(cls.__name__, 0) + size
+    else:
+        breakdown = sizes
+    return SizeReport(total=total, objects=objects, breakdown=breakdown, truncated=truncated)
+
+
+class SizeEstimate(namedtuple("SizeEstimate", ("estimate", "low", "high", "sampled"))):
+    """ Result of `getsize` with `sample`, `low` and `high` make up the confidence interval of `estimate` in bytes.
+        `sampled` is the number of measured elements, the interval has no width if every element was measured. """
+    __slots__ = ()
+
+
+def _getsize_sampled_elements(obj, positions):
+    """ Yield elements of obj at sorted positions, dicts yield `(key, value)`. """
+    if isinstance(obj, (list, tuple)):
+        for position in positions:
+            yield (obj[position], )
+        return
+
+    iterator = iter(obj.items() if isinstance(obj, dict) else obj)
+    previous = -1
+    for position in positions:
+        element = next(islice(iterator, position - previous - 1, None))
+        previous = position
+        yield element if isinstance(obj, dict) else (element, )
+
+
+def _getsize_sample(obj, sample, confidence):
+    """ Estimate size of a container by deeply measuring a random sample of it's elements. """
+    if not isinstance(obj, (list, tuple, set, frozenset, dict)) or len(obj) <= sample:
+        size = getsize(obj)
+        return SizeEstimate(estimate=size, low=size, high=size, sampled=len(obj) if hasattr(obj, "__len__") else 0)
+
+    n = len(obj)
+    positions = sorted(random.sample(range(n), sample))
+    sizes = [getsize(*element) for element in _getsize_sampled_elements(obj=obj, positions=positions)]
+
+    mean = statistics.fmean(sizes)
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    margin = n * z * statistics.stdev(sizes) / sample ** 0.5 * ((n - sample) / (n - 1)) ** 0.5  # Finite population correction
+    estimate = sys.getsizeof(obj) + n * mean
+    return SizeEstimate(estimate=round(estimate), low=round(estimate - margin), high=round(estimate + margin), sampled=sample)
+
+
+def getsize(*objs, max_objects=None, max_bytes=None, sample=None, confidence=0.95):
     """
-    Get a sum of sizes from an object and it's members in bytes.
+    Get a sum of sizes from objects and their members in bytes, see `getsize_report` for a breakdown.
     Custom objects know their class.
     Function objects seem to know way too much, including modules.
     Exclude modules as well.
 
     Author: Aaron Hall @ https://stackoverflow.com/questions/449560/how-do-i-determine-the-size-of-an-object-in-python
+
+    :param objs: Root objects, shared referents are only counted once.
+    :param int max_objects: Stop after counting this many objects.
+    :param int max_bytes: Stop once total reaches this many bytes.
+    :param int sample: Estimate size of a single list, tuple, set or dict by measuring this many random elements and return a SizeEstimate.
+        Referents shared between elements are counted once per sampled element.
+    :param float confidence: Confidence level of SizeEstimate's interval.
     """
-    _BLACKLIST = type, ModuleType, FunctionType
-    if isinstance(obj, _BLACKLIST):
-        # raise TypeError('getsize() does not take argument of type: '+ str(type(obj)))
-        return sys.getsizeof(obj)
-    seen_ids = set()
-    size = 0
-    objects = [obj]
-    while objects:
-        need_referents = []
-        for obj in objects:
-            if not isinstance(obj, _BLACKLIST) and id(obj) not in seen_ids:
-                seen_ids.add(id(obj))
-                size += sys.getsizeof(obj)
-                need_referents.append(obj)
-        objects = get_referents(*need_referents)
-    return size
+    if sample is not None:
+        if len(objs) != 1 or sample < 2:
+            raise AttributeError("Sampling requires exactly one object and a sample of at least 2.")
+        return _getsize_sample(obj=objs[0], sample=sample, confidence=confidence)
+    return getsize_report(*objs, max_objects=max_objects, max_bytes=max_bytes, by=None).total
+
+
+def _initBases_steps(cls, cls_init, defaults, post_inits):
+    """ Flatten the inits that an initBases wrapper would call into a list of `(init, unpack, defaults)`.
+        Inits of bases wrapped by initBases are inlined with their own defaults underneath the given ones.
+        Found `__init_post__` methods are appended to post_inits in the order they would be called. """
+    steps = []
+    initialized_bases = []
+    for base in cls.__bases__ + (cls, ):
+        init = cls_init if base is cls else base.__init__
+
+        if init is object.__init__ or init in initialized_bases:
+            continue
+        initialized_bases.append(init)
+
+        wrapped = getattr(init, "_initBases_wrapped", None)
+        if wrapped:
+            base_cls, base_init = wrapped
+            steps.extend(_initBases_steps(base_cls, base_init, {**SignatureSpec.get(base_init).defaults, **defaults}, post_inits))
+        else:
+            steps.append((init, SigBinder(init).unpack, defaults))
+
+        post_init = getattr(base, "__init_post__", None)
+        if post_init and post_init not in post_inits:
+            post_inits.append(post_init)
+    return steps
 
 
 def initBases(cls):
@@ -39,44 +231,50 @@ def initBases(cls):
     Wrap a class' unbound __init__ method to take any arguments.
     When wrapper is called it iterates DIRECT bases to call their unbound __init__ methods along with it's own original __init__.
 
-    Also looks for defined `__init_post__` methods, stores them in `instance.__init_post__s` and calls them all after all inits.
+    Also looks for defined `__init_post__` methods and calls them all after all inits if instance's class is the decorated class.
+
+    The order of calls is planned once per class on first instantiation, inits of bases that are also wrapped by initBases are inlined.
     """
     cls_init = cls.__init__  # Unbound original __init__ method of class
 
     cls._is_wrapped_by_initBases = cls
+    plan = None
 
     def _wrapper(*args, **kwargs):
-        cls_SigInfo = SigInfo(cls_init, *args, **kwargs)
+        nonlocal plan
+        if plan is None:
+            post_inits = []
+            steps = _initBases_steps(cls, cls_init, {}, post_inits)
+            plan = SigBinder(cls_init).bind, steps, [(post_init, SigBinder(post_init).unpack) for post_init in post_inits]
+        bind, steps, post_steps = plan
 
-        if not cls_SigInfo["self"]:
+        allArgs = bind(*args, **kwargs)
+        if "self" not in allArgs:
             raise AttributeError(f"{cls} hasn't defined it's `__init__`")
 
-        initialized_bases = []
-
-        if getattr(cls_SigInfo["self"], "__init_post__s", None) is None:
-            cls_SigInfo["self"].__init_post__s = []
-
+        for init, unpack, defaults in steps:
+            init_args, init_kwargs = unpack({**defaults, **allArgs} if defaults else allArgs)
+            init(*init_args, **init_kwargs)
 
-        for base in cls.__bases__ + (cls, ):
-            init = cls_init if base is cls else base.__init__
-
-            if init is not object.__init__ and init not in initialized_bases:
-                cls_SigInfo.call(child_callable=init)
-                initialized_bases.append(init)
-
-
-                if getattr(base, "__init_post__", None) and base.__init_post__ not in cls_SigInfo["self"].__init_post__s:
-                    cls_SigInfo["self"].__init_post__s.append(base.__init_post__)
-        if cls is cls_SigInfo["self"].__class__ and getattr(cls_SigInfo["self"], "__init_post__s", None) is not None:
-            for post_init in cls_SigInfo["self"].__init_post__s:
-                cls_SigInfo.call(child_callable=post_init)
+        if cls is allArgs["self"].__class__:
+            for post_init, unpack in post_steps:
+                post_args, post_kwargs = unpack(allArgs)
+                post_init(*post_args, **post_kwargs)
 
+    _wrapper._initBases_wrapped = cls, cls_init
     cls.__init__ = _wrapper
     return cls
 
 
-from generallibrary.functions import SigInfo
-from generallibrary.objinfo.objinfo import ObjInfo
+from generallibrary.functions import SignatureSpec, SigBinder
+
+
+def __getattr__(name):
+    """ Lazily import ObjInfo, it depends on TreeDiagram which depends on initBases. """
+    if name == "ObjInfo":
+        from generallibrary.objinfo.objinfo import ObjInfo
+        return ObjInfo
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 
@@ -0,0 +1,29 @@
+""" Compare deco_cache with and without thread_safe when many threads request the same cold keys.
+    Shows wall time and how many times the expensive function was actually called. """
+from generallibrary import deco_cache, Timer, sleep
+from concurrent.futures import ThreadPoolExecutor
+import random
+
+
+def run(threads, thread_safe, keys=20, requests=400):
+    calls = []
+
+    @deco_cache(maxsize=None, thread_safe=thread_safe)
+    def expensive(key):
+        calls.append(key)
+        sleep(0.01)
+        return key
+
+    random.seed(0)
+    requested = [random.randrange(keys) for _ in range(requests)]
+
+    timer = Timer()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(expensive, requested))
+    return timer.seconds(), len(calls)
+
+
+for threads in (8, 16, 32):
+    for thread_safe in (False, True):
+        seconds, calls = run(threads=threads, thread_safe=thread_safe)
+        print(f"{threads} threads, thread_safe={thread_safe!s:<5}: {seconds:.3f} seconds, {calls} computations")
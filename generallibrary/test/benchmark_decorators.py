@@ -0,0 +1,45 @@
+""" Compare method call overhead of decorators with an undecorated method. """
+from generallibrary import deco_default_self_args, initBases, Timer
+
+
+class _Foo:
+    x = 1
+
+    def __init__(self):
+        self.y = 2
+
+    def undecorated(self, x=None, y=None, z=3):
+        return x, y, z
+
+    @deco_default_self_args
+    def decorated(self, x, y, z=3):
+        return x, y, z
+
+
+class _Base:
+    def __init__(self, x, y=2):
+        self.x = x
+
+    def __init_post__(self):
+        pass
+
+
+@initBases
+class _Bar(_Base):
+    def __init__(self, x, y=3):
+        self.y = y
+
+
+def calls_per_second(func, n=200000):
+    timer = Timer()
+    for _ in range(n):
+        func()
+    return round(n / timer.seconds())
+
+
+foo = _Foo()
+for name, func in {"Undecorated": foo.undecorated,
+                   "deco_default_self_args": foo.decorated,
+                   "deco_default_self_args, given args": lambda: foo.decorated(1, 2),
+                   "initBases instantiation": lambda: _Bar(1)}.items():
+    print(f"{name + ':':<40}{calls_per_second(func)} calls per second")
@@ -0,0 +1,24 @@
+""" Time sibling navigation on a TreeDiagram node with 100k children. """
+from generallibrary import TreeDiagram, Timer
+
+
+def seconds(func, *nodes):
+    timer = Timer()
+    for node in nodes:
+        func(node)
+    return timer.seconds()
+
+
+parent = TreeDiagram()
+timer = Timer()
+children = [TreeDiagram(parent=parent) for _ in range(100000)]
+print(f"{'Create 100k children:':<40}{timer.seconds():.3f} seconds")
+
+for name, func in {"get_index": TreeDiagram.get_index,
+                   "get_next_sibling": TreeDiagram.get_next_sibling,
+                   "get_previous_sibling": TreeDiagram.get_previous_sibling}.items():
+    print(f"{name + ' on every child:':<40}{seconds(func, *children):.3f} seconds")
+
+print(f"{'remove 1000 last children:':<40}{seconds(TreeDiagram.remove, *reversed(children[-1000:])):.3f} seconds")
+print(f"{'add 1000 children:':<40}{seconds(lambda _: TreeDiagram(parent=parent), *range(1000)):.3f} seconds")
+print(f"{'set_index to 0 on 100 last children:':<40}{seconds(lambda node: node.set_index(0), *parent.get_children()[-100:]):.3f} seconds")
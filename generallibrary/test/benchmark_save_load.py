@@ -0,0 +1,46 @@
+""" Throughput of TreeDiagram save, load, dump and load_stream on a wide and a deep tree with 1M nodes each. """
+import io
+
+from generallibrary import TreeDiagram, Timer
+
+
+def wide_tree(n, width=10):
+    nodes = [TreeDiagram()]
+    for i in range(1, n):
+        nodes.append(TreeDiagram(parent=nodes[(i - 1) // width]))
+    return nodes[0]
+
+
+def deep_tree(n):
+    top = node = TreeDiagram()
+    for _ in range(n - 1):
+        node = TreeDiagram(parent=node)
+    return top
+
+
+n = 1000000
+for name, create in {"Wide": wide_tree, "Deep": deep_tree}.items():
+    top = create(n)
+
+    timer = Timer()
+    saved = top.save()
+    seconds = timer.seconds()
+    print(f"{name + ' save:':<20}{seconds:.2f} seconds, {round(n / seconds)} nodes per second")
+
+    timer = Timer()
+    TreeDiagram.load(saved)
+    seconds = timer.seconds()
+    print(f"{name + ' load:':<20}{seconds:.2f} seconds, {round(n / seconds)} nodes per second")
+    del saved
+
+    file = io.StringIO()
+    timer = Timer()
+    top.dump(file)
+    seconds = timer.seconds()
+    print(f"{name + ' dump:':<20}{seconds:.2f} seconds, {round(n / seconds)} nodes per second")
+
+    file.seek(0)
+    timer = Timer()
+    TreeDiagram.load_stream(file)
+    seconds = timer.seconds()
+    print(f"{name + ' load_stream:':<20}{seconds:.2f} seconds, {round(n / seconds)} nodes per second")
@@ -0,0 +1,43 @@
+""" Compare calls per second of different ways to bind and call a function.
+    Clearing the SignatureSpec cache for each call is a lower bound of SigInfo's old behaviour,
+    which reflected the signature for every property access. """
+from generallibrary import SigInfo, Timer
+from generallibrary.functions import SignatureSpec
+import inspect
+
+
+def hello(x, y=2, *args, z=3, **kwargs):
+    return x
+
+
+def calls_per_second(func, n=20000):
+    timer = Timer()
+    for i in range(n):
+        func(i)
+    return round(n / timer.seconds())
+
+
+def uncached_siginfo(i):
+    SignatureSpec._cache.clear()
+    return SigInfo(hello, i, 5, 6, z=4, foo="bar").call()
+
+
+def cached_siginfo(i):
+    return SigInfo(hello, i, 5, 6, z=4, foo="bar").call()
+
+
+signature = inspect.signature(hello)
+def signature_bind(i):
+    boundArguments = signature.bind(i, 5, 6, z=4, foo="bar")
+    boundArguments.apply_defaults()
+    return hello(*boundArguments.args, **boundArguments.kwargs)
+
+
+binder = SigInfo.compile(hello)
+def compiled_binder(i):
+    return binder.call(i, 5, 6, z=4, foo="bar")
+
+
+for name, func in {"Uncached SignatureSpec": uncached_siginfo, "Cached SignatureSpec": cached_siginfo,
+                   "inspect.Signature.bind": signature_bind, "SigInfo.compile": compiled_binder}.items():
+    print(f"{name + ':':<24}{calls_per_second(func)} calls per second")
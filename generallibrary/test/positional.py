@@ -16,4 +16,11 @@ def positional(self):
     self.assertEqual(["x", "y"], SigInfo(lambda x, /, y, z=2: 5).namesRequired)
     self.assertEqual(["x", "s"], SigInfo(lambda x, y=2, /, b=4, *args, z=3, s, **kwargs: None).namesRequired)
 
-    self.assertEqual({"y": 2, "b": 4, "z": 3}, SigInfo(lambda x, y=2, /, b=4, *args, z=3, s, **kwargs: None).defaults)
\ No newline at end of file
+    self.assertEqual({"y": 2, "b": 4, "z": 3}, SigInfo(lambda x, y=2, /, b=4, *args, z=3, s, **kwargs: None).defaults)
+    func = lambda x, y=2, /, b=4, *args, z=3, s, **kwargs: (x, y, b, args, z, s, kwargs)
+    binder = SigInfo.compile(func)
+    for args, kwargs in (((1, ), {"s": 2}), ((1, 2, 3, 4), {"s": 2, "foo": 5}), ((1, ), {"y": 5, "s": 2})):
+        sigInfo = SigInfo(func, *args, **kwargs)
+        self.assertEqual(sigInfo.allArgs, binder.bind(*args, **kwargs))
+        self.assertEqual((sigInfo.unpackedArgs, sigInfo.unpackedKwargs), binder.unpack(binder.bind(*args, **kwargs)))
+        self.assertEqual(sigInfo.call(), binder.call(*args, **kwargs))
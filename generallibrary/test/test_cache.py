@@ -0,0 +1,266 @@
+import unittest
+import gc
+import asyncio
+
+from generallibrary.cache import deco_cache, Cache
+from generallibrary.time import sleep
+
+
+class CacheTest(unittest.TestCase):
+    def test_Cache(self):
+        cache = Cache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.set("c", 3)
+        self.assertEqual(None, cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.stats.evictions)
+
+        cache = Cache(maxsize=0)
+        cache.set("a", 1)
+        self.assertEqual(0, len(cache))
+
+    def test_ttl(self):
+        cache = Cache(ttl=0.05)
+        cache.set("a", 1)
+        self.assertEqual(1, cache.get("a"))
+        sleep(0.06)
+        self.assertEqual(None, cache.get("a"))
+        self.assertEqual(1, cache.stats.expired)
+        self.assertEqual(0, len(cache))
+
+    def test_max_bytes(self):
+        cache = Cache(maxsize=None, max_bytes=1000)
+        cache.set("big", "x" * 2000)
+        self.assertNotIn("big", cache)
+
+        for i in range(100):
+            cache.set(i, [i])
+        self.assertLessEqual(cache.bytes, 1000)
+        self.assertGreater(len(cache), 0)
+        self.assertIn(99, cache)
+        self.assertNotIn(0, cache)
+
+    def test_deco_cache(self):
+        calls = []
+
+        @deco_cache(maxsize=2)
+        def foo(x, y=2):
+            calls.append(x)
+            return x * y
+
+        self.assertEqual(2, foo(1))
+        self.assertEqual(2, foo(1))
+        self.assertEqual([1], calls)
+        foo(2)
+        foo(3)
+        foo(1)
+        self.assertEqual([1, 2, 3, 1], calls)
+
+        info = foo.cache_info()
+        self.assertEqual((1, 4, 2, 2), (info.hits, info.misses, info.evictions, info.currsize))
+        foo.cache_clear()
+        self.assertEqual((0, 0, 0), foo.cache_info()[:3])
+        self.assertEqual(0, foo.cache_info().currsize)
+        self.assertEqual("foo", foo.__name__)
+
+        cached_int = deco_cache()(int)  # No signature
+        self.assertEqual(5, cached_int("5"))
+        self.assertEqual(5, cached_int("5"))
+        self.assertEqual((1, 1), cached_int.cache_info()[:2])
+
+    def test_deco_cache_per_instance(self):
+        class A:
+            def __init__(self, x):
+                self.x = x
+
+            @deco_cache()
+            def foo(self, y):
+                return self.x + y
+
+            def __eq__(self, other):
+                return True
+            __hash__ = object.__hash__
+
+        a, b = A(1), A(2)
+        self.assertEqual(2, a.foo(1))
+        self.assertEqual(3, b.foo(1))
+        self.assertEqual(2, A.foo.cache_info().currsize)
+
+        del a
+        gc.collect()
+        self.assertEqual(1, A.foo.cache_info().currsize)
+
+    def test_deco_cache_normalize(self):
+        calls = []
+
+        @deco_cache(normalize=True)
+        def foo(a, b=2, *args, c=3, **kwargs):
+            calls.append(a)
+            return a + b + c + sum(args) + sum(kwargs.values())
+
+        self.assertEqual(6, foo(1))
+        self.assertEqual(6, foo(1, 2))
+        self.assertEqual(6, foo(1, b=2))
+        self.assertEqual(6, foo(a=1, c=3))
+        self.assertEqual(1, len(calls))
+
+        self.assertEqual(10, foo(1, 2, 4))
+        self.assertEqual(12, foo(1, x=4, y=6, c=-1))
+        self.assertEqual(12, foo(1, y=6, x=4, c=-1))
+        self.assertEqual(3, len(calls))
+
+        class A:
+            def __init__(self, x):
+                self.x = x
+
+            @deco_cache(normalize=True)
+            def foo(self, y=1):
+                return self.x + y
+
+        a = A(1)
+        self.assertEqual(2, a.foo())
+        self.assertEqual(2, a.foo(1))
+        self.assertEqual(2, a.foo(y=1))
+        self.assertEqual(3, A(2).foo())
+        self.assertEqual((2, 2), A.foo.cache_info()[:2])
+        self.assertRaises(TypeError, a.foo, 1, 2)
+        self.assertRaises(TypeError, a.foo, z=1)
+
+        @deco_cache(normalize=True)
+        def bar(x):
+            return x
+
+        self.assertEqual(None, bar(None))
+        self.assertRaises(TypeError, bar)
+        self.assertRaises(TypeError, bar, None, 2, 3)
+        self.assertRaises(TypeError, bar, None, bogus=1)
+        self.assertRaises(TypeError, bar, None, x=None)
+        self.assertEqual(None, bar(x=None))
+
+    def test_deco_cache_async(self):
+        calls = []
+
+        @deco_cache(normalize=True, ttl=0.2)
+        async def foo(x, y=2):
+            calls.append(x)
+            await asyncio.sleep(0.02)
+            if x is None:
+                raise ValueError("x is None")
+            return x * y
+
+        async def main():
+            results = await asyncio.gather(*[foo(1), foo(1, 2), foo(x=1), foo(2)])
+            self.assertEqual([2, 2, 2, 4], results)
+            self.assertEqual([1, 2], calls)
+
+            self.assertEqual(2, await foo(1))
+            self.assertEqual([1, 2], calls)
+
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    await foo(None)
+            self.assertEqual([1, 2, None, None], calls)
+
+            await asyncio.sleep(0.21)
+            self.assertEqual(2, await foo(1))
+            self.assertEqual([1, 2, None, None, 1], calls)
+
+        asyncio.run(main())
+
+    def test_deco_cache_thread_safe(self):
+        from concurrent.futures import ThreadPoolExecutor
+        calls = []
+
+        @deco_cache(thread_safe=True, stripes=4)
+        def foo(x):
+            calls.append(x)
+            sleep(0.02)
+            if x is None:
+                raise ValueError("x is None")
+            return x * 2
+
+        with ThreadPoolExecutor(16) as executor:
+            results = list(executor.map(foo, [1, 2, 3, 4] * 8))
+        self.assertEqual([2, 4, 6, 8] * 8, results)
+        self.assertEqual([1, 2, 3, 4], sorted(calls))
+
+        with ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(foo, None) for _ in range(4)]
+        for future in futures:
+            self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(4, foo.cache_info().currsize)
+
+    def test_deco_cache_threads(self):
+        import sys
+        from concurrent.futures import ThreadPoolExecutor
+
+        for kwargs in ({"maxsize": 4}, {"maxsize": 4, "ttl": 0.0001}):
+            @deco_cache(**kwargs)
+            def foo(x):
+                return x * 2
+
+            def work(i):
+                return [foo(x) for x in range((i % 8) * 3, (i % 8) * 3 + 2000)]
+
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+                with ThreadPoolExecutor(8) as executor:
+                    results = list(executor.map(work, range(8)))
+            finally:
+                sys.setswitchinterval(interval)
+
+            for i, result in enumerate(results):
+                self.assertEqual([x * 2 for x in range((i % 8) * 3, (i % 8) * 3 + 2000)], result)
+            info = foo.cache_info()
+            self.assertLessEqual(info.currsize, 4)
+            self.assertEqual(8 * 2000, info.hits + info.misses)
+
+    def test_deco_cache_directory(self):
+        import tempfile
+        calls = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            def foo(x, y=2):
+                calls.append(x)
+                return x * y
+
+            self.assertEqual(2, deco_cache(directory=directory)(foo)(1))
+            self.assertEqual(2, deco_cache(directory=directory)(foo)(1, y=2))  # New memory cache like a restarted process
+            self.assertEqual([1], calls)
+
+            def foo(x, y=2):
+                calls.append(x)
+                return x * y + 1
+
+            cached_foo = deco_cache(directory=directory)(foo)
+            self.assertEqual(0, len(list(cached_foo.disk_cache.directory.iterdir())))  # Changed source removed old results
+            self.assertEqual(3, cached_foo(1))
+            self.assertEqual([1, 1], calls)
+            self.assertRaises(TypeError, deco_cache(directory=directory)(foo), 1, 2, 3)  # Doesn't bind, so never shares the file of foo(1)
+            self.assertRaises(TypeError, deco_cache(directory=directory)(foo), 1, z=3)
+
+            cached_foo = deco_cache(directory=directory, max_disk_bytes=1000)(lambda x: "x" * x)
+            for i in range(10):
+                cached_foo(200 + i)
+            self.assertLessEqual(sum(path.stat().st_size for path in cached_foo.disk_cache.directory.iterdir()), 1000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            cached_foo = deco_cache(directory=directory, max_disk_bytes=2000)(lambda x: "x" * 100)
+            disk = cached_foo.disk_cache
+            evictions = []
+            evict = disk.evict
+            disk.evict = lambda: evictions.append(1) or evict()
+            for i in range(100):
+                cached_foo(i)
+            self.assertLess(len(evictions), 50)  # Not on every write once full
+            self.assertLessEqual(sum(path.stat().st_size for path in disk.directory.iterdir()), 2000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            inc, dbl = deco_cache(directory=directory)(lambda x: x + 1), deco_cache(directory=directory)(lambda x: x * 2)
+            self.assertEqual((6, 10), (inc(5), dbl(5)))
+            inc, dbl = deco_cache(directory=directory)(lambda x: x + 1), deco_cache(directory=directory)(lambda x: x * 2)
+            self.assertEqual((6, 10), (inc(5), dbl(5)))
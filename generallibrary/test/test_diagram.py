@@ -65,6 +65,28 @@ class TreeDiagramTest(unittest.TestCase):
         c.set_index(1)
         self.assertEqual(a.get_children(), [b, c])
 
+    def test_depth(self):
+        a = TreeDiagram()
+        b = TreeDiagram(parent=a)
+        c = TreeDiagram(parent=b)
+        d = TreeDiagram(parent=c)
+        self.assertEqual([0, 1, 2, 3], [node.depth for node in a.get_all()])
+        self.assertEqual([c, b, a, None], [d.get_parent(index) for index in range(4)])
+        self.assertEqual([a, b, c, None], [d.get_parent(index) for index in range(-1, -5, -1)])
+
+        c.set_parent(a)
+        self.assertEqual((1, 2), (c.depth, d.depth))
+        self.assertEqual([c, a, None], [d.get_parent(index) for index in range(3)])
+
+        b.set_parent(d)
+        self.assertEqual((2, 3), (d.depth, b.depth))
+
+        c.remove()
+        self.assertEqual((0, 1, 2), (c.depth, d.depth, b.depth))
+        self.assertEqual(b.get_all_parents(), [b.get_parent(index) for index in range(b.depth)])
+
+        self.assertEqual([1, 2, 3], [node.depth for node in c.copy_to(parent=a).get_all()])
+
     def test_get_all(self):
         a = TreeDiagram()
         self.assertEqual([a], a.get_all())
@@ -81,6 +103,36 @@ class TreeDiagramTest(unittest.TestCase):
         b.remove()
         self.assertEqual([a, c], a.get_all())
 
+    def test_iter_all(self):
+        a = TreeDiagram()
+        b = TreeDiagram(parent=a)
+        c = TreeDiagram(parent=a)
+        d = TreeDiagram(parent=b)
+        e = TreeDiagram(parent=d)
+        f = TreeDiagram(parent=c)
+
+        self.assertEqual([a, b, d, e, c, f], list(a.iter_all()))
+        self.assertEqual([e, d, b, f, c, a], list(a.iter_all(order="post")))
+        self.assertEqual([a, b, c, d, f, e], list(a.iter_all(order="level")))
+
+        self.assertEqual([b, d, e, c, f], a.get_all(include_self=False))
+        self.assertEqual([e, d, b, f, c], a.get_all(include_self=False, order="post"))
+        self.assertEqual([b, c, d, f, e], a.get_all(include_self=False, order="level"))
+
+        self.assertEqual([a, b, d, c, f], a.get_all(max_depth=2))
+        self.assertEqual([d, b, f, c, a], a.get_all(order="post", max_depth=2))
+        self.assertEqual([a, b, c], a.get_all(order="level", max_depth=1))
+        for order in ("pre", "post", "level"):
+            self.assertEqual([a], a.get_all(order=order, max_depth=0))
+            self.assertEqual([], a.get_all(order=order, max_depth=0, include_self=False))
+            self.assertEqual([e], e.get_all(order=order))
+
+        self.assertRaises(AttributeError, a.get_all, order="foo")
+
+        wide = TreeDiagram()
+        children = [TreeDiagram(parent=wide) for _ in range(10000)]
+        self.assertEqual(children, wide.get_all(include_self=False))
+
     def test_copy_to(self):
         a = TreeDiagram()
         b = TreeDiagram(parent=a)
@@ -93,6 +145,61 @@ class TreeDiagramTest(unittest.TestCase):
         b.remove()
         self.assertNotEqual(str(a.get_all()), str(a_copy))
 
+    def test_load_hook_order(self):
+        from generallibrary import initBases
+        events = []
+
+        @initBases
+        class A(TreeDiagram):
+            def __init__(self, name=None, parent=None):
+                self.name = self.data_keys_add("name", name)
+
+            def hook_create_post(self):
+                events.append((self.name, [child.name for child in self.get_children()]))
+
+        a = A("a")
+        b = A("b", parent=a)
+        A("c", parent=b)
+        A("d", parent=a)
+        events.clear()
+
+        A.load(a.save())
+        self.assertEqual([("c", []), ("b", ["c"]), ("d", []), ("a", ["b", "d"])], events)
+
+    def test_save_load_deep(self):
+        import sys
+        top = node = TreeDiagram()
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = TreeDiagram(parent=node)
+        TreeDiagram(parent=top)
+
+        saved = top.save()
+        self.assertEqual(2, len(saved["children_dicts"]))
+        copy = TreeDiagram.load(saved)
+        self.assertEqual(len(top.get_all()), len(copy.get_all()))
+        self.assertEqual(node.depth, copy.get_all(order="post")[0].depth)
+        self.assertEqual([1, 1], [child.depth for child in copy.get_children()])
+
+    def test_view(self):
+        import io
+        a = TreeDiagram()
+        b = TreeDiagram(parent=a)
+        c = TreeDiagram(parent=b)
+        d = TreeDiagram(parent=b)
+        e = TreeDiagram(parent=a)
+        names = {a: "a", b: "b", c: "c", d: "d", e: "e"}
+
+        self.assertEqual("a\n├─ b\n│  ├─ c\n│  └─ d\n└─ e", a.view(custom_repr=names.get, print_out=False))
+        self.assertEqual("├─ b\n│  ├─ c\n│  └─ d", b.view(custom_repr=names.get, print_out=False))
+        self.assertEqual("b\n├─ c\n└─ d", b.view(custom_repr=names.get, print_out=False, relative=True))
+        self.assertEqual("│  └─ d", d.view(custom_repr=names.get, print_out=False))
+        self.assertEqual("a\n├──.b\n│...├──.c\n│...└──.d\n└──.e", a.view(custom_repr=names.get, print_out=False, indent=2, spacer="."))
+
+        file = io.StringIO()
+        self.assertIs(None, a.view(custom_repr=names.get, file=file))
+        self.assertEqual(f"{a.view(custom_repr=names.get, print_out=False)}\n", file.getvalue())
+        self.assertEqual(["a", "├─ b"], list(a.view_lines(custom_repr=names.get))[:2])
+
     def test_siblings(self):
         a = TreeDiagram()
         self.assertEqual([], a.get_siblings())
@@ -128,6 +235,148 @@ class TreeDiagramTest(unittest.TestCase):
         self.assertEqual(None, e.get_next_sibling())
         self.assertEqual(c, e.get_previous_sibling())
 
+    def test_sibling_positions(self):
+        import random
+        random.seed(1)
+        a = TreeDiagram()
+        nodes = []
+        for _ in range(300):
+            action = random.random()
+            if action < 0.4 or not nodes:
+                nodes.append(TreeDiagram(parent=a))
+            elif action < 0.6:
+                index = random.randrange(len(nodes) + 1)
+                nodes.insert(index, TreeDiagram().set_parent(a, index=index))
+            elif action < 0.8:
+                nodes.pop(random.randrange(len(nodes))).remove()
+            else:
+                node = random.choice(nodes)
+                node.set_index(random.randrange(len(nodes)))
+                nodes = a.get_children()
+
+            self.assertEqual(nodes, a.get_children())
+            if nodes:
+                node = random.choice(nodes)
+                index = nodes.index(node)
+                self.assertEqual(index, node.get_index())
+                self.assertIs(nodes[index + 1] if index + 1 < len(nodes) else None, node.get_next_sibling())
+                self.assertIs(nodes[index - 1] if index else None, node.get_previous_sibling())
+                self.assertEqual(nodes[:index] + nodes[index + 1:], node.get_siblings())
+
+    def test_sibling_positions_copy(self):
+        import copy
+        import pickle
+        a = TreeDiagram()
+        for _ in range(5):
+            TreeDiagram(parent=a)
+        a.get_child(2).get_index()
+
+        for new_a in (copy.deepcopy(a), pickle.loads(pickle.dumps(a))):
+            children = new_a.get_children()
+            self.assertEqual(5, len(children))
+            self.assertEqual(2, children[2].get_index())
+            self.assertIs(children[3], children[2].get_next_sibling())
+            self.assertIs(children[1], children[2].get_previous_sibling())
+            children[2].remove()
+            self.assertEqual(2, children[3].get_index())
+            self.assertEqual(children[:2] + children[3:], new_a.get_children())
+            self.assertEqual(5, len(a.get_children()))
+
+    def test_unique_data_keys(self):
+        from generallibrary import initBases
+        @initBases
+        class A(TreeDiagram):
+            def __init__(self, name=None, parent=None):
+                self.name = self.data_keys_add("name", name, unique=True)
+
+        top = A()
+        b = A("b", parent=top)
+        c = A("c", parent=top)
+        self.assertIs(b, top.get_child_by_key_values(name="b"))
+        self.assertEqual([c], top.get_children_by_key_values(name="c"))
+
+        b2 = A("b", parent=top)
+        self.assertEqual([c, b2], top.get_children())
+        self.assertIs(None, b.get_parent())
+        self.assertIs(b2, top.get_child_by_key_values(name="b"))
+
+        c.name = "d"
+        self.assertIs(None, top.get_child_by_key_values(name="c"))
+        self.assertIs(c, top.get_child_by_key_values(name="d"))
+        A("d", parent=top)
+        self.assertIs(None, c.get_parent())
+
+        b2.remove()
+        self.assertEqual([], top.get_children_by_key_values(name="b"))
+
+        e = A(["unhashable"], parent=top)
+        self.assertIs(e, top.get_child_by_key_values(name=["unhashable"]))
+        A(["unhashable"], parent=top)
+        self.assertIs(None, e.get_parent())
+
+        for i in range(3000):
+            A(str(i), parent=top)
+        A("1500", parent=top)
+        self.assertEqual(3002, len(top.get_children()))
+        self.assertEqual("1500", top.get_child(-1).name)
+
+        @initBases
+        class B(TreeDiagram):
+            def __init__(self, name=None, parent=None):
+                self.name = self.data_keys_add("name", name)
+
+        top = TreeDiagram()
+        a = A("x", parent=top)
+        b = B("x", parent=top)
+        self.assertEqual([a, b], top.get_children_by_key_values(name="x"))
+        A("x", parent=top)
+        self.assertIs(None, a.get_parent())
+        self.assertIs(None, b.get_parent())
+        self.assertEqual(1, len(top.get_children()))
+
+    def test_dump_load_stream(self):
+        import io
+        import sys
+        import json
+        from generallibrary import initBases
+        @initBases
+        class A(TreeDiagram):
+            def __init__(self, foo=None, parent=None):
+                self.foo = self.data_keys_add("foo", foo, use_in_repr=True)
+
+        top = A("top")
+        b = A("b", parent=top)
+        A("c", parent=b)
+        A("d", parent=top)
+
+        for order in ("pre", "level"):
+            file = io.StringIO()
+            top.dump(file, order=order)
+            records = [json.loads(line) for line in file.getvalue().splitlines()]
+            self.assertEqual({"id": 0, "parent_id": None, "class_name": "A", "data": {"foo": "top"}}, records[0])
+            self.assertEqual(["top", "b", "c", "d"] if order == "pre" else ["top", "b", "d", "c"], [record["data"]["foo"] for record in records])
+
+            file.seek(0)
+            copy = A.load_stream(file)
+            self.assertEqual(top.view(print_out=False), copy.view(print_out=False))
+            self.assertEqual("c", copy.get_child().get_child().foo)
+
+        file = io.StringIO()
+        b.dump(file)
+        file.seek(0)
+        nodes = A.iter_load_stream(file, parent=top)
+        self.assertIs(top, next(nodes).get_parent())
+        self.assertEqual(["c"], [node.foo for node in nodes])
+        self.assertRaises(AttributeError, top.dump, file, order="post")
+
+        deep = node = TreeDiagram()
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = TreeDiagram(parent=node)
+        file = io.StringIO()
+        deep.dump(file)
+        file.seek(0)
+        self.assertEqual(node.depth, TreeDiagram.load_stream(file).get_all(order="post")[0].depth)
+
     def test_data_keys(self):
         from generallibrary import initBases
         @initBases
@@ -1,7 +1,11 @@
 
 import unittest
+import operator
+import weakref
+import gc
 
-from generallibrary import SigInfo, defaults, VerInfo, deco_cache, deco_cast_parameters, EmptyContext, deco_default_self_args, classproperty
+from generallibrary.functions import SignatureSpec, SigBinder
+from generallibrary import SigInfo, Operators, calculate, calculate_many, defaults, VerInfo, deco_cache, deco_cast_parameters, EmptyContext, deco_default_self_args, classproperty, CallTable
 
 def _orphan():
     pass
@@ -36,6 +40,39 @@ class FunctionsTest(unittest.TestCase):
                 return x, y, z
 
         self.assertEqual((1, 2, 3), A().foo())
+        self.assertEqual((None, 2, 3), A().foo(None))
+        self.assertEqual((1, 4, 5), A().foo(y=4, z=5))
+        self.assertEqual((1, 2, 3), A().foo(1, 2, 3, 4, w=5))  # Unknown args are dropped like SigInfo does
+        self.assertEqual((1, 0, 3), A().foo(1, 2, 3, y=0))  # Keyword wins like SigInfo does
+        self.assertEqual((5, 2, 3), A.foo(A(), x=5, self=A()))
+        self.assertIsNotNone(A.foo.__module__)
+
+        class B:
+            x = 1
+
+            @deco_default_self_args
+            def foo(self, x, *args, y, z=3, **kwargs):
+                return x, args, y, z, kwargs
+
+        b = B()
+        self.assertEqual((1, (), 2, 3, {}), b.foo(y=2))
+        self.assertEqual((5, (6, ), 2, 3, {"w": 4}), b.foo(5, 6, y=2, w=4))
+        self.assertEqual((5, (), 2, 3, {}), B.foo(self=b, x=5, y=2))
+        self.assertEqual((9, (8, 7, 6), 2, 1, {}), b.foo(9, 8, 7, 6, z=1, y=2))
+        self.assertEqual((1, (), 2, 3, {}), B.foo(b, self=b, y=2))
+        with self.assertRaises(AttributeError) as context:
+            b.foo()
+        self.assertEqual(f"Missing attribute 'y' for instance '{b}'.", str(context.exception))
+
+        class C:
+            x = 1
+
+            @deco_default_self_args
+            def foo(this, x):
+                return x
+
+        self.assertRaises(AttributeError, C().foo)
+        self.assertEqual(2, C().foo(2))
 
     def test_class_from_callable(self):
         self.assertEqual(FunctionsTest, SigInfo(lambda: None).class_from_callable())
@@ -193,6 +230,145 @@ class FunctionsTest(unittest.TestCase):
         sigInfo["x"] = 3
         self.assertEqual(3, sigInfo.call())
 
+    def test_SignatureSpec(self):
+        def hello(x, y=2, *args, **kwargs):
+            pass
+        self.assertIs(SigInfo(hello).spec, SigInfo(hello, 1, 2, 3).spec)
+        self.assertIs(SignatureSpec.get(hello), SigInfo(hello).spec)
+        self.assertIsNot(SignatureSpec(hello), SignatureSpec.get(hello))
+
+        spec = SignatureSpec.get(hello)
+        self.assertEqual(("x", "y", "args", "kwargs"), spec.names)
+        self.assertRaises(AttributeError, setattr, spec, "names", ())
+        self.assertRaises(TypeError, operator.setitem, spec.defaults, "x", 1)
+
+        class _Foo:
+            def bar(self, x):
+                return x
+        self.assertIs(SigInfo(_Foo().bar).spec, SigInfo(_Foo().bar).spec)
+        self.assertEqual(["x"], SigInfo(_Foo().bar).names)
+        self.assertIs(_Foo.bar, SigInfo(_Foo.bar).defaults["self"])
+        self.assertEqual(["x"], SigInfo(_Foo.bar).namesRequired)
+
+        import gc
+        import weakref
+        def temp(self, x):
+            pass
+        SigInfo(temp)
+        ref = weakref.ref(temp)
+        del temp
+        gc.collect()
+        self.assertIs(None, ref())
+
+    def test_SigInfo_compile(self):
+        class _Foo:
+            def bar(self, x, y=2):
+                return self, x, y
+
+        funcs = (
+            lambda: None,
+            lambda x: x,
+            lambda x, y=2: (x, y),
+            lambda *args: args,
+            lambda x, *args: (x, args),
+            lambda x, y=6, *args, z=7, **kwargs: (x, y, args, z, kwargs),
+            lambda x, **kwargs: (x, kwargs),
+            lambda *, x, y=3: (x, y),
+            _Foo.bar,
+            _Foo().bar,
+        )
+        calls = (
+            ((), {}),
+            ((1, ), {}),
+            ((1, 2), {}),
+            ((1, 2, 3, 4), {}),
+            ((), {"x": 5}),
+            ((1, ), {"y": 5}),
+            ((1, 2, 3), {"z": 4, "foo": "bar"}),
+            ((), {"self": 1, "x": 2}),
+        )
+        for func in funcs:
+            binder = SigInfo.compile(func)
+            for args, kwargs in calls:
+                sigInfo = SigInfo(func, *args, **kwargs)
+                allArgs = binder.bind(*args, **kwargs)
+                self.assertEqual(sigInfo.allArgs, allArgs)
+                self.assertEqual((sigInfo.unpackedArgs, sigInfo.unpackedKwargs), binder.unpack(allArgs))
+
+                try:
+                    result = sigInfo.call()
+                except TypeError:
+                    self.assertRaises(TypeError, binder.call, *args, **kwargs)
+                else:
+                    self.assertEqual(result, binder.call(*args, **kwargs))
+
+        func = lambda x, *args: (x, args)
+        sigInfo = SigInfo(func, 1, 2)
+        sigInfo["args"] = []
+        self.assertEqual((sigInfo.unpackedArgs, sigInfo.unpackedKwargs), SigInfo.compile(func).unpack(sigInfo.allArgs))
+
+    def test_SigInfo_compile_many_parameters(self):
+        for count in (150, SigBinder.max_generated + 50):
+            namespace = {}
+            names = [f"x{i}" for i in range(count)]
+            exec(f"def func({', '.join(names)}, *args, y=None, **kwargs): return [{', '.join(names)}], args, y, kwargs", namespace)
+            func = namespace["func"]
+
+            binder = SigInfo.compile(func)
+            for args, kwargs in (((), {}), (tuple(range(count + 2)), {"y": 1, "z": 2}), (tuple(range(5)), {"x9": 9})):
+                sigInfo = SigInfo(func, *args, **kwargs)
+                allArgs = binder.bind(*args, **kwargs)
+                self.assertEqual(sigInfo.allArgs, allArgs)
+                self.assertEqual((sigInfo.unpackedArgs, sigInfo.unpackedKwargs), binder.unpack(allArgs))
+            self.assertEqual(SigInfo(func, *range(count + 1)).call(), binder.call(*range(count + 1)))
+
+    def test_calculate(self):
+        self.assertEqual(10, calculate("x**2 + y * x", 2, 3))
+        self.assertEqual(3, calculate("sqrt(x) + 1", 4))
+        self.assertEqual(2, calculate("(x + 1) * x", 1, 5))  # Extra args are ignored
+        self.assertEqual(0.1 + 0.2, calculate("a + b", 0.1, 0.2))
+        self.assertEqual(1 / 3, calculate("a * 3", 1 / 9))
+
+        self.assertEqual([3, 5, 7], list(calculate_many("x * 2 + y", [1, 2, 3], [1, 1, 1])))
+        self.assertEqual([2, 3], list(calculate_many("sqrt(x)", [4, 9])))
+        self.assertEqual([2, 12], calculate_many("x * y", rows=[(1, 2), (3, 4)]))
+
+    def test_SigInfo_call_many(self):
+        from concurrent.futures import ThreadPoolExecutor
+        sigInfo = SigInfo(lambda x, y=2, *args, **kwargs: (x, y, args, kwargs), 1)
+        mappings = [{"y": 3}, {"x": 5}, {"args": [4, 5], "foo": 6}]
+        expected = [(1, 3, (), {}), (5, 2, (), {}), (1, 2, (4, 5), {"foo": 6})]
+        self.assertEqual(expected, list(sigInfo.call_many(mappings)))
+        self.assertEqual([SigInfo(sigInfo.callableObject, **{**sigInfo.allArgs, **mapping}).call() for mapping in mappings], expected)
+
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(expected, list(sigInfo.call_many(mappings, executor=executor)))
+            self.assertCountEqual(expected, list(sigInfo.call_many(iter(mappings), executor=executor, ordered=False)))
+
+            consumed = []
+            def _mappings():
+                for i in range(100):
+                    consumed.append(i)
+                    yield {"x": i}
+
+            for ordered in (True, False):
+                consumed.clear()
+                results = sigInfo.call_many(_mappings(), executor=executor, ordered=ordered, window=4)
+                next(results)
+                self.assertLessEqual(len(consumed), 5)
+                self.assertEqual(99, len(list(results)))
+
+        class A:
+            def foo(self, x):
+                return x
+
+        a = A()
+        ref = weakref.ref(a)
+        self.assertEqual([1, 2], list(SigInfo(a.foo).call_many([{"x": 1}, {"x": 2}])))
+        del a
+        gc.collect()
+        self.assertIsNone(ref())  # Binder isn't kept alive after call_many
+
     def test_defaults(self):
         self.assertEqual({"a": 5, "b": 3}, defaults({"a": 5}, b=3))
         self.assertEqual({"a": 5, "b": 3}, defaults({"a": 5, "b": 3}, b=4))
@@ -231,12 +407,103 @@ class FunctionsTest(unittest.TestCase):
         _test()
         self.assertLess(time.time() - start_time, 0.39)
 
+    def test_Operators(self):
+        @Operators.deco_define_comparisons(lambda left: left.x, lambda right: getattr(right, "x", right))
+        class A:
+            def __init__(self, x):
+                self.x = x
+
+        self.assertTrue(A(1) == 1)
+        self.assertTrue(A(1) == A(1))
+        self.assertTrue(A(1) < A(2))
+        self.assertTrue(A(2) >= 2)
+        self.assertFalse(A(2) <= 1)
+        self.assertEqual([1, 2, 3], [a.x for a in sorted([A(3), A(1), A(2)])])
+
+        @Operators.deco_define_comparisons(lambda left, right: left.x, lambda right, left: getattr(right, "x", right), cache_right=True, hashable=True)
+        class B:
+            def __init__(self, x):
+                self.x = x
+
+        b = B(1)
+        self.assertTrue(B(2) > b)
+        b.x = 5
+        self.assertFalse(B(2) > b)  # Right value was not cached as rightLambda takes left too
+        self.assertEqual(2, len({B(1), B(1), B(2)}))
+
+        @Operators.deco_define_comparisons(lambda left: left.x, lambda right: getattr(right, "x", right), cache_right=True)
+        class C:
+            def __init__(self, x):
+                self.x = x
+
+        c = C(1)
+        self.assertTrue(C(2) > c)
+        c.x = 5
+        self.assertTrue(C(2) > c)
+        self.assertFalse(C(2) > C(5))
+
     def test_deco_cast_parameters(self):
         @deco_cast_parameters(x=int)
         def test(x):
             return x
         self.assertEqual(True, isinstance(test("2"), int))
 
+        @deco_cast_parameters(x=int, y=float, z=str)
+        def test(x, y=2, *args, z, **kwargs):
+            return x, y, args, z, kwargs
+        self.assertEqual((1, 2, (), "3", {}), test("1", z=3))
+        self.assertEqual((1, 2.5, (3, ), "None", {"foo": 4}), test(True, "2.5", 3, z=None, foo=4))
+        self.assertEqual((1, 2, (), "3", {}), test(x=1, z="3"))
+        self.assertIs(float, type(test(1, 3.0, z="")[1]))
+        self.assertIs(int, type(test(1, 3, z="")[1]))  # typeChecker allows int for float
+
+        @deco_cast_parameters(x=list)
+        def test(x=()):
+            return x
+        self.assertEqual([], test())
+        x = []
+        self.assertIs(x, test(x))
+
+        self.assertRaises(AttributeError, deco_cast_parameters(y=int), lambda x: x)
+
+        @deco_cast_parameters(x=int)
+        def test(x, *, y=None):
+            return x, y
+        self.assertEqual((1, None), test(1, 2))  # Extra args are dropped whether casting or not
+        self.assertEqual((1, None), test("1", 2))
+        self.assertEqual((1, None), test(1, z=3))
+        self.assertEqual((1, None), test("1", z=3))
+        self.assertEqual((2, None), test(1, x=2))
+        self.assertEqual((2, None), test("1", x="2"))
+        self.assertEqual((1, 2), test(1, y=2))
+
+
+    def test_CallTable(self):
+        import time
+        callTable = CallTable("x").set_funcs(double=lambda x: x * 2, fail=lambda x: x / 0).set_args(one=1, two=2)
+        md = callTable.generate()
+        self.assertIn("double", md)
+        self.assertIn("-", md)
+        self.assertEqual(md, callTable.generate())
+
+        callTable.parallel = "thread"
+        self.assertEqual(md, callTable.generate())
+
+        callTable.timing = True
+        callTable.repeat = 3
+        self.assertEqual(2, callTable.generate().count("| x "))
+        self.assertIsInstance(callTable.timings["double"]["one"], float)
+        self.assertIs(None, callTable.timings["fail"]["one"])
+
+        callTable = CallTable("x", timeout=0.05).set_funcs(slow=lambda x: time.sleep(x)).set_args(fast=0, slow=0.5)
+        self.assertIn("timeout", callTable.generate())
+
+        callTable = CallTable("x", workers=1, timeout=0.3).set_funcs(sleep=lambda x: time.sleep(x) or "done").set_args(slow=1.0, fast=0, fast2=0)
+        start = time.perf_counter()
+        md = callTable.generate()
+        self.assertLess(time.perf_counter() - start, 0.9)
+        self.assertEqual(1, md.count("timeout"))
+        self.assertEqual(2, md.count("done"))
 
     def test_EmptyContext(self):
         with EmptyContext():
@@ -0,0 +1,33 @@
+import unittest
+import subprocess
+import sys
+import os
+from pathlib import Path
+
+import generallibrary
+
+
+class InitTest(unittest.TestCase):
+    heavy_modules = ("pandas", "pyperclip", "pytz", "pkg_resources", "distutils", "asyncio", "multiprocessing", "concurrent.futures")
+
+    def importtime(self, code):
+        """ Return names of all modules imported by code in a fresh interpreter, using `python -X importtime`. """
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join((str(Path(generallibrary.__file__).parent.parent), os.environ.get("PYTHONPATH", "")))}
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True, check=True).stderr
+        return [line.split("|")[-1].strip() for line in stderr.splitlines() if line.startswith("import time:") and "|" in line]
+
+    def test_importtime(self):
+        for code in ("import generallibrary", "from generallibrary import clamp", "from generallibrary import TreeDiagram, SigInfo, deco_cache, VerInfo"):
+            modules = self.importtime(code)
+            self.assertIn("generallibrary", modules)
+            for heavy in self.heavy_modules:
+                self.assertNotIn(heavy, modules, code)
+
+        self.assertNotIn("generallibrary.diagram", self.importtime("from generallibrary import clamp"))
+
+    def test_lazy_names(self):
+        for name in generallibrary.__all__:
+            self.assertIs(getattr(generallibrary, name), getattr(sys.modules[generallibrary._name_to_module[name]], name))
+        self.assertTrue(set(generallibrary.__all__).issubset(dir(generallibrary)))
+        with self.assertRaises(AttributeError):
+            generallibrary.not_existing_name
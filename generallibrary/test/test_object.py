@@ -1,7 +1,7 @@
 
 import unittest
 
-from generallibrary.object import getsize, initBases
+from generallibrary.object import getsize, getsize_report, initBases
 from generallibrary import ObjInfo
 from generallibrary.objinfo.type import _ObjInfoType
 
@@ -14,6 +14,50 @@ class ObjectTest(unittest.TestCase):
         z = [y]
         self.assertGreater(getsize(z), getsize(x) + getsize(y))  # See that there's overhead
 
+    def test_getsize_report(self):
+        shared = ["shared"] * 100
+        a = [shared, 1.5]
+        b = {"b": shared}
+        self.assertEqual(getsize(a) + getsize(b) - getsize(shared), getsize(a, b))
+
+        report = getsize_report(a, b)
+        self.assertEqual(getsize(a, b), report.total)
+        self.assertEqual(report.total, sum(report.breakdown.values()))
+        self.assertEqual(False, report.truncated)
+        self.assertIn("float", report.breakdown)
+
+        report = getsize_report(a, b, by="root")
+        self.assertEqual(getsize(a), report.breakdown[0])
+        self.assertEqual(getsize(b) - getsize(shared), report.breakdown[1])
+
+        report = getsize_report(b, by="attribute")
+        self.assertEqual(getsize(shared), report.breakdown["b"] - getsize("b"))
+
+        report = getsize_report(list(range(1000, 2000)), max_objects=10)
+        self.assertEqual((10, True), (report.objects, report.truncated))
+        self.assertGreaterEqual(getsize_report(list(range(1000, 2000)), max_bytes=100).total, 100)
+
+        data = bytearray(10000)
+        view = memoryview(data)[::2]
+        self.assertEqual(getsize(view), getsize(view, data))
+        self.assertEqual(getsize(view), getsize(data, view))
+        self.assertGreater(getsize(view), 10000)
+
+        self.assertRaises(AttributeError, getsize_report, a, by="foo")
+
+    def test_getsize_sample(self):
+        values = {i: "x" * (i % 50) for i in range(1000, 21000)}
+        for obj in (values, list(values.values()), set(values)):
+            estimate = getsize(obj, sample=500)
+            self.assertEqual(500, estimate.sampled)
+            self.assertLessEqual(estimate.low, estimate.estimate)
+            self.assertLessEqual(estimate.estimate, estimate.high)
+            self.assertLess(abs(estimate.estimate - getsize(obj)) / getsize(obj), 0.1)
+
+        self.assertEqual((getsize([1, 2]), ) * 3 + (2, ), getsize([1, 2], sample=10))
+        self.assertEqual(getsize(5), getsize(5, sample=10).estimate)
+        self.assertRaises(AttributeError, getsize, [1], [2], sample=10)
+
     def test_initBases(self):
         # One argument without default
         class Base:
@@ -193,6 +237,37 @@ class ObjectTest(unittest.TestCase):
         C()
         self.assertEqual([1, 2, 3, 4, 5, 6], glob)
 
+    def test__init_post__args(self):
+        glob = []
+
+        class A:
+            def __init__(self, x, y=2):
+                glob.append(("A", x, y))
+
+            def __init_post__(self, y):
+                glob.append(("A post", y))
+
+        @initBases
+        class B(A):
+            def __init__(self, x, y=3):
+                glob.append(("B", x, y))
+
+        @initBases
+        class C(B):
+            def __init__(self, x, z=4):
+                glob.append(("C", x, z))
+
+            def __init_post__(self, x, z):
+                glob.append(("C post", x, z))
+
+        C(1)
+        self.assertEqual([("A", 1, 3), ("B", 1, 3), ("C", 1, 4), ("A post", None), ("C post", 1, 4)], glob)
+        self.assertEqual(False, hasattr(C(1), "__init_post__s"))
+
+        glob.clear()
+        B(5, y=6)
+        self.assertEqual([("A", 5, 6), ("B", 5, 6), ("A post", 6)], glob)
+
     def test_ObjInfo(self):
         def check(bound_method):
             """ Check that the correct method is True and all other are False. """
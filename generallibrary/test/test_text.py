@@ -1,6 +1,7 @@
 
 import unittest
-from generallibrary.text import comma_and_and
+import io
+from generallibrary.text import comma_and_and, markdown_table, markdown_table_lines
 
 class CodeTest(unittest.TestCase):
     def test_comma_and_and(self):
@@ -15,6 +16,25 @@ class CodeTest(unittest.TestCase):
         self.assertEqual("a", comma_and_and("a", period=False))
         self.assertEqual("", comma_and_and(period=False))
 
+    def test_markdown_table(self):
+        dicts = [{"a": 1, "b": "x"}, {"a": 22.5, "c": "y|y"}]
+        self.assertEqual("""|    a | b | c    |
+|-----:|:--|:-----|
+|    1 | x |      |
+| 22.5 |   | y\\|y |""", markdown_table(dicts))
+        self.assertEqual("""| a | b |
+|--:|:--|
+| 1 | x |
+| 22.5 |  |""", markdown_table(iter(dicts), pad=False))
+        self.assertEqual("""| c    |    a |
+|:-----|-----:|
+|      |    1 |
+| y\\|y | 22.5 |""", markdown_table(dicts, headers=["c", "a"]))
 
+        file = io.StringIO()
+        self.assertIs(None, markdown_table(({"i": i} for i in range(3)), file=file, pad=False))
+        self.assertEqual("| i |\n|--:|\n| 0 |\n| 1 |\n| 2 |\n", file.getvalue())
 
-
+        self.assertEqual("", markdown_table([]))
+        self.assertEqual(["| a |", "|:--|"], list(markdown_table_lines([], headers=["a"], pad=False)))
+        self.assertEqual(["| True |", "|:-----|", "| True |"], list(markdown_table_lines([{True: True}])))
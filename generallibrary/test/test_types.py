@@ -1,7 +1,7 @@
 
 import unittest
 
-from generallibrary.types_ import strToDynamicType, typeChecker, getBaseClasses, getBaseClassNames, hasMethod, HierarchyStorer
+from generallibrary.types_ import strToDynamicType, typeChecker, compileTypeChecker, getBaseClasses, getBaseClassNames, hasMethod, HierarchyStorer
 
 
 class InheritStr(str):
@@ -110,6 +110,17 @@ class TypesTest(unittest.TestCase):
         self.assertFalse(typeChecker(True, int, error=False))
         self.assertFalse(typeChecker(True, "int", error=False))
 
+    def test_compileTypeChecker(self):
+        values = (5, 5.2, True, None, "hello", InheritStr("hi"), [], [1], ["hello"], (), {"a": 2}, int)
+        types_list = ((int, ), (float, ), (bool, ), (str, ), ("str", ), (list, ), ((list, tuple), int), ((int, None), ), (object, ), (list, str))
+        for types in types_list:
+            checker = compileTypeChecker(*types)
+            for value in values:
+                self.assertEqual(typeChecker(value, *types, error=False), checker(value), (value, types))
+
+        self.assertRaises(TypeError, compileTypeChecker)
+        self.assertRaises(TypeError, compileTypeChecker, 5)
+
     def test_getBasesClasses(self):
         self.assertEqual([int, object], getBaseClasses(True))
         self.assertEqual(["int", "object"], getBaseClassNames(True))
@@ -1,7 +1,7 @@
 """."""
 import unittest
 
-from generallibrary.versions import VerInfo, get_installed_packages, package_is_installed
+from generallibrary.versions import VerInfo, get_installed_packages, package_is_installed, PythonVersion
 
 
 class VersionsTest(unittest.TestCase):
@@ -48,6 +48,20 @@ class VersionsTest(unittest.TestCase):
         self.assertFalse(verInfo.pythonVersion == "2.0.1")
         self.assertTrue(verInfo.pythonVersion == verInfo.pythonString)
 
+    def test_PythonVersion(self):
+        versions = [PythonVersion("3.9.1"), PythonVersion("3.8.0"), PythonVersion("3.10.0"), PythonVersion("3.8.0")]
+        self.assertEqual(["3.8.0", "3.8.0", "3.9.1", "3.10.0"], [str(ver) for ver in sorted(versions)])
+        self.assertRaises(TypeError, hash, PythonVersion("3.8.0"))  # Equals strings, so it can't hash like them
+        self.assertTrue(PythonVersion("3.8.0") == "3.8")
+
+    def test_Ver(self):
+        import pickle
+        from generallibrary.versions import Ver
+        ver = Ver("1.2.3")
+        self.assertEqual(Ver("1.2.4"), ver.bump())
+        self.assertEqual(ver, pickle.loads(pickle.dumps(ver)))
+        self.assertIs(Ver, pickle.loads(pickle.dumps(Ver)))
+
     def test_conditionalFunctionalities(self):
         verInfo = VerInfo()
         self.assertEqual(1, sum((verInfo.pathRootHasColon, verInfo.pathRootIsDelimiter)))
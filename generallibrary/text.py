@@ -1,3 +1,6 @@
+import itertools
+
+
 
 
 def comma_and_and(*values, period=True):
@@ -10,3 +13,90 @@ def comma_and_and(*values, period=True):
         return f"{values[0]}{period}"
     else:
         return f"{', '.join(values[:-1])} and {values[-1]}{period}"
+
+
+
+def _markdown_table_cell(value):
+    """ Return value as a string that is safe inside a markdown table cell. """
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def _markdown_table_is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _markdown_table_row(cells):
+    return f"| {' | '.join(cells)} |"
+
+
+def _markdown_table_separator(widths, right):
+    return f"|{'|'.join(f'{dashes}:' if is_right else f':{dashes}' for dashes, is_right in zip(('-' * (width + 1) for width in widths), right))}|"
+
+
+def markdown_table_lines(dicts, headers=None, pad=True):
+    """ Generator yielding lines of a markdown pipe table made from dicts.
+        Missing keys give empty cells, columns with only ints and floats are right aligned.
+
+        :param collections.Iterable[dict] dicts: Rows as dicts, can be a generator.
+        :param list headers: Keys to use as columns, defaults to every key in order of appearance.
+        :param pad: Pad cells so that columns line up, this reads all rows first while storing their cells as strings.
+            Otherwise each row is yielded as soon as it's read, headers then default to the keys of the first row. """
+    iterator = iter(dicts)
+
+    if not pad:
+        first = next(iterator, None)
+        if headers is None:
+            headers = list(first or ())
+        if not headers:
+            return
+        yield _markdown_table_row(_markdown_table_cell(header) for header in headers)
+        yield _markdown_table_separator(widths=[len(_markdown_table_cell(header)) for header in headers], right=[first is not None and _markdown_table_is_number(first.get(header)) for header in headers])
+        if first is not None:
+            for row in itertools.chain((first, ), iterator):
+                yield _markdown_table_row(_markdown_table_cell(row[header]) if header in row else "" for header in headers)
+        return
+
+    fixed = headers is not None
+    widths = {header: len(_markdown_table_cell(header)) for header in headers or ()}
+    right = dict.fromkeys(widths)
+    rows = []
+    for row in iterator:
+        cells = {}
+        for key, value in row.items():
+            if key not in widths:
+                if fixed:
+                    continue
+                widths[key] = len(_markdown_table_cell(key))
+                right[key] = None
+            cell = cells[key] = _markdown_table_cell(value)
+            if len(cell) > widths[key]:
+                widths[key] = len(cell)
+            if right[key] is not False:
+                right[key] = _markdown_table_is_number(value)
+        rows.append(cells)
+
+    if not widths:
+        return
+    headers = list(widths)
+    widths = [widths[header] for header in headers]
+    right = [bool(right[header]) for header in headers]
+
+    def _justify(cells):
+        return _markdown_table_row(cell.rjust(width) if is_right else cell.ljust(width) for cell, width, is_right in zip(cells, widths, right))
+
+    yield _justify(_markdown_table_cell(header) for header in headers)
+    yield _markdown_table_separator(widths=widths, right=right)
+    for cells in rows:
+        yield _justify(cells.get(header, "") for header in headers)
+
+
+def markdown_table(dicts, headers=None, pad=True, file=None):
+    """ Return a markdown pipe table made from dicts as a string, or write it line by line to a file object.
+        See `markdown_table_lines` for parameters.
+
+        :param file: Optional file object with a `write` method, returns None if given. """
+    lines = markdown_table_lines(dicts=dicts, headers=headers, pad=pad)
+    if file is None:
+        return "\n".join(lines)
+    for line in lines:
+        file.write(f"{line}\n")
@@ -1,7 +1,6 @@
 
 import time
 from datetime import datetime
-import pytz
 
 
 class Timer:
@@ -39,6 +38,8 @@ def sleep(seconds):
 
 def current_datetime(timezone="Europe/Paris"):
     """ Get current aware datetime. """
+    import pytz
+
     return datetime.utcnow().replace(tzinfo=pytz.utc).astimezone(pytz.timezone(timezone))
 
 
@@ -126,6 +126,34 @@ def typeChecker(obj, *types, error=True):
     else:
         return True
 
+def compileTypeChecker(*types):
+    """
+    Prepare types once and return a function that returns whether an object passes `typeChecker(obj, *types)`.
+    Objects whose exact type is one of the single layer types are accepted without walking anything.
+
+    :param types: Same as typeChecker's types
+    :raises TypeError: If types are invalid
+    :rtype: function
+    """
+    literalObjects = [None]
+    if not types:
+        raise TypeError("No types were given as args")
+
+    types = _typeChecker_prepareTypesList(types, literalObjects)
+    exactTypes = set()
+    if len(types) == 1:
+        exactTypes = {t for t in types[0] if isinstance(t, type) and not issubclass(t, (tuple, list, dict, type(None)))}
+
+    def _checker(obj):
+        if type(obj) in exactTypes:
+            return True
+        try:
+            _typeChecker_checkObject(obj, types, literalObjects)
+        except TypeError:
+            return False
+        return True
+    return _checker
+
 
 def getBaseClasses(obj, includeSelf=False, includeObject=True):
     """
@@ -7,20 +7,15 @@ Get package info?
 from generallibrary.object import initBases
 
 from packaging import version
-import pkg_resources
-from distutils.version import StrictVersion
-import re
 
 
-# Todo: Replace this temporary Ver class with revamped VerInfo split into isolated parts.
-class Ver(StrictVersion):
-    def __init__(self, ver):
-        super().__init__(str(ver))
-
-    def bump(self):
-        """ Return a new Ver with bumped last value. """
-        bulk, micro = re.findall("(.*)(\\d)", str(self))[0]
-        return Ver(f"{bulk}{int(micro) + 1}")
+def __getattr__(name):
+    """ Lazily import Ver to defer importing distutils, see PEP 562. """
+    if name == "Ver":
+        from generallibrary._ver import Ver
+        globals()["Ver"] = Ver
+        return Ver
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 
@@ -202,7 +197,7 @@ class DuckTyping:
 
 from generallibrary.functions import Operators
 
-@Operators.deco_define_comparisons(lambda left: left.version, lambda right: version.parse(str(right)))
+@Operators.deco_define_comparisons(lambda left: left.version, lambda right: version.parse(str(right)), cache_right=True)
 class PythonVersion(DuckTyping):
     """ Used by VerInfo.pythonVersion to easily compare python versions to int, float or string. """
     def __init__(self, pythonString):
@@ -214,6 +209,9 @@ class PythonVersion(DuckTyping):
             Protect variable."""
         return self._version
 
+    def __str__(self):
+        return str(self.version)
+
     def __eq__(self, other): ...
     def __gt__(self, other): ...
     def __lt__(self, other): ...
@@ -222,6 +220,8 @@ class PythonVersion(DuckTyping):
 
 def get_installed_packages():
     """ Get a list of all installed packages as strings. """
+    import pkg_resources
+
     return [pkg.key for pkg in pkg_resources.working_set]
 
 def package_is_installed(*names):
@@ -13,8 +13,6 @@ setup(
     install_requires=[
         'packaging',
         'pyperclip',
-        'pandas',
-        'tabulate',
         'pytz',
     ],
     url="https://github.com/ManderaGeneral/generallibrary",